@@ -26,7 +26,7 @@ class ActionList:
             list[Action]: La lista de acciones posibles a hacer.
         """
 
-        free_path = [0, 2, 4] # El valor que puede tener una casilla para poder ir
+        walls = hero.map.walls
 
         (x, y) = hero.pos
 
@@ -34,38 +34,38 @@ class ActionList:
 
         # En caso de que tenga una víctima
         if hero.has_victim:
-            if hero.map.walls.get_up(x, y) in free_path:
+            if walls.is_open(x, y, 0):
                 possible_actions.append(MoveWithVictim(2, hero, 0))
-            if hero.map.walls.get_right(x, y) in free_path:
+            if walls.is_open(x, y, 1):
                 possible_actions.append(MoveWithVictim(2, hero, 1))
-            if hero.map.walls.get_down(x, y) in free_path:
+            if walls.is_open(x, y, 2):
                 possible_actions.append(MoveWithVictim(2, hero, 2))
-            if hero.map.walls.get_left(x, y) in free_path:
+            if walls.is_open(x, y, 3):
                 possible_actions.append(MoveWithVictim(2, hero, 3))
 
         # Si no tiene víctima, puede pasar por el fuego o caminar normal
         else:
-            if hero.map.walls.get_up(x, y) in free_path:
+            if walls.is_open(x, y, 0):
                 if hero.map.ghosts.get_up(x, y) != 2:
                     possible_actions.append(Move(1, hero, 0))
-            if hero.map.walls.get_right(x, y) in free_path:
+            if walls.is_open(x, y, 1):
                 if hero.map.ghosts.get_right(x, y) != 2:
                     possible_actions.append(Move(1, hero, 1))
-            if hero.map.walls.get_down(x, y) in free_path:
+            if walls.is_open(x, y, 2):
                 if hero.map.ghosts.get_down(x, y) != 2:
                     possible_actions.append(Move(1, hero, 2))
-            if hero.map.walls.get_left(x, y) in free_path:
+            if walls.is_open(x, y, 3):
                 if hero.map.ghosts.get_left(x, y) != 2:
                     possible_actions.append(Move(1, hero, 3))
 
         # Se añaden las posibilidades de abrir puertas
-        if hero.map.walls.get_up(x, y) == 3:
+        if walls.is_door(x, y, 0):
             possible_actions.append(OpenDoor(1, hero, 0))
-        if hero.map.walls.get_right(x, y) == 3:
+        if walls.is_door(x, y, 1):
             possible_actions.append(OpenDoor(1, hero, 1))
-        if hero.map.walls.get_down(x, y) == 3:
+        if walls.is_door(x, y, 2):
             possible_actions.append(OpenDoor(1, hero, 2))
-        if hero.map.walls.get_left(x, y) == 3:
+        if walls.is_door(x, y, 3):
             possible_actions.append(OpenDoor(1, hero, 3))
 
         # Se añaden las posibilidades de cerrar puertas
@@ -196,15 +196,29 @@ class Action(ABC):
     
         return self.action_points <= self.hero.action_points
 
-    @abstractmethod
     def do_action(self):
-        """Método abstracto para realizar la acción."""
+        """Realiza la acción: gasta los puntos, cambia el tablero y, si el
+        mapa arma payloads, agrega los eventos al json del turno.
+        """
 
         self.hero.action_points -= self.action_points
 
         # TODO: Verifica si alguna de las coordenadas sale del mapa
 
-        pass
+        self.apply()
+
+        if self.hero.map.payloads: # Sin payloads no se arma el json
+            self.add_payload()
+
+        return True
+
+    @abstractmethod
+    def apply(self):
+        """Método abstracto para cambiar el tablero con la acción."""
+
+    @abstractmethod
+    def add_payload(self):
+        """Método abstracto para agregar los eventos de la acción al json."""
 
 class Move(Action):
     """Mueve el héroe a otra casilla siempre y cuando
@@ -215,13 +229,14 @@ class Move(Action):
     def is_possible(self):
         return super().is_possible()
 
-    def do_action(self):
+    def apply(self):
         """Mueve el héroe a otra casilla"""
 
-        super().do_action()
-
         self.hero.update_position(self.action_x, self.action_y)
-        
+
+    def add_payload(self):
+        """Agrega los eventos de la acción al json del turno."""
+
         agent = {
             "x": self.action_x,
             "y": self.action_y,
@@ -234,8 +249,6 @@ class Move(Action):
 
         self.hero.json["agents"].append(agent)
 
-        return True
-
 class MoveWithVictim(Action):
     """Mueve el héroe a otra casilla mientras carga una
     víctima.
@@ -256,11 +269,9 @@ class MoveWithVictim(Action):
     
     
 
-    def do_action(self):
+    def apply(self):
         """Mueve el héroe y la víctima a otra casilla"""
 
-        super().do_action()
-
         self.hero.update_position(self.action_x, self.action_y)
 
         # Verifica si acaba de salvar a la persona
@@ -269,6 +280,9 @@ class MoveWithVictim(Action):
             self.hero.has_victim = False # Ya que ya salvó la víctima
             self.hero.map.poi.current -= 1
 
+    def add_payload(self):
+        """Agrega los eventos de la acción al json del turno."""
+
         agent = {
             "x": self.action_x,
             "y": self.action_y,
@@ -284,19 +298,15 @@ class MoveWithVictim(Action):
 
         self.hero.json["agents"].append(agent)
 
-        return True
-
 class OpenDoor(Action):
     """Abre una puerta alrededor del héroe."""
 
     def is_possible(self):
         return super().is_possible()
 
-    def do_action(self):
+    def apply(self):
         """Abre la puerta."""
 
-        super().do_action()
-
         if self.direction == self.UP:
             self.hero.map.walls.set_up(self.current_x, self.current_y, 2)
         elif self.direction == self.RIGHT:
@@ -306,6 +316,9 @@ class OpenDoor(Action):
         elif self.direction == self.LEFT:
             self.hero.map.walls.set_left(self.current_x, self.current_y, 2)
 
+    def add_payload(self):
+        """Agrega los eventos de la acción al json del turno."""
+
         agent = {
             "x": self.current_x,
             "y": self.current_y,
@@ -327,19 +340,15 @@ class OpenDoor(Action):
         self.hero.json["agents"].append(agent)
         self.hero.json["walls"].append(wall)
 
-        return True
-
 class CloseDoor(Action):
     """Cierra una puerta alrededor del héroe."""
 
     def is_possible(self):
         return super().is_possible()
 
-    def do_action(self):
+    def apply(self):
         """Cierra la puerta."""
 
-        super().do_action()
-
         if self.direction == self.UP:
             self.hero.map.walls.set_up(self.current_x, self.current_y, 3)
         elif self.direction == self.RIGHT:
@@ -349,6 +358,9 @@ class CloseDoor(Action):
         elif self.direction == self.LEFT:
             self.hero.map.walls.set_left(self.current_x, self.current_y, 3)
 
+    def add_payload(self):
+        """Agrega los eventos de la acción al json del turno."""
+
         agent = {
             "x": self.current_x,
             "y": self.current_y,
@@ -370,19 +382,15 @@ class CloseDoor(Action):
         self.hero.json["agents"].append(agent)
         self.hero.json["walls"].append(wall)
 
-        return True
-
 class DamageWall(Action):
     """Daña una pared alrededor del héroe."""
 
     def is_possible(self):
         return super().is_possible()
 
-    def do_action(self):
+    def apply(self):
         """Daña la pared."""
 
-        super().do_action()
-
         if self.direction == self.UP:
             self.hero.map.walls.set_up(self.current_x, self.current_y, 0.5)
         elif self.direction == self.RIGHT:
@@ -394,6 +402,9 @@ class DamageWall(Action):
 
         self.hero.map.damage_points += 1
 
+    def add_payload(self):
+        """Agrega los eventos de la acción al json del turno."""
+
         agent = {
             "x": self.current_x,
             "y": self.current_y,
@@ -415,19 +426,15 @@ class DamageWall(Action):
         self.hero.json["agents"].append(agent)
         self.hero.json["walls"].append(wall)
 
-        return True
-
 class DestroyWall(Action):
     """Destruye una pared alrededor del héroe."""
 
     def is_possible(self):
         return super().is_possible()
 
-    def do_action(self):
+    def apply(self):
         """Destruye la pared."""
 
-        super().do_action()
-
         if self.direction == self.UP:
             self.hero.map.walls.set_up(self.current_x, self.current_y, 0)
         elif self.direction == self.RIGHT:
@@ -439,6 +446,9 @@ class DestroyWall(Action):
 
         self.hero.map.damage_points += 1
 
+    def add_payload(self):
+        """Agrega los eventos de la acción al json del turno."""
+
         agent = {
             "x": self.current_x,
             "y": self.current_y,
@@ -460,8 +470,6 @@ class DestroyWall(Action):
         self.hero.json["agents"].append(agent)
         self.hero.json["walls"].append(wall)
 
-        return True
-
 class ClearFog(Action):
     """Dispersa una niebla alrededor del héroe."""
 
@@ -471,18 +479,20 @@ class ClearFog(Action):
 
         self.update_coords()
 
-        if not (self.action_x, self.action_y) in self.hero.map.walls.get_neighbors(self.current_x, self.current_y) and (self.action_x, self.action_y) != (self.current_x, self.current_y):
+        # Solo en su casilla o hacia una vecina accesible
+        if self.direction != self.SAME and not self.hero.map.walls.is_open(self.current_x, self.current_y, self.direction):
             return False
 
         return super().is_possible()
 
-    def do_action(self):
+    def apply(self):
         """Dispersa la niebla alrededor del héroe."""
 
-        super().do_action()
-
         self.hero.map.ghosts.set_on(self.action_x, self.action_y, 0)
 
+    def add_payload(self):
+        """Agrega los eventos de la acción al json del turno."""
+
         agent = {
             "x": self.current_x,
             "y": self.current_y,
@@ -503,8 +513,6 @@ class ClearFog(Action):
         self.hero.json["agents"].append(agent)
         self.hero.json["ghosts"].append(ghost)
 
-        return True
-
 class ScareGhost(Action):
     """Ahuyenta un fantasma alrededor del héroe."""
 
@@ -514,18 +522,20 @@ class ScareGhost(Action):
 
         self.update_coords()
 
-        if not (self.action_x, self.action_y) in self.hero.map.walls.get_neighbors(self.current_x, self.current_y) and (self.action_x, self.action_y) != (self.current_x, self.current_y):
+        # Solo en su casilla o hacia una vecina accesible
+        if self.direction != self.SAME and not self.hero.map.walls.is_open(self.current_x, self.current_y, self.direction):
             return False
 
         return super().is_possible()
     
-    def do_action(self):
+    def apply(self):
         """Ahuyenta el fantasma."""
 
-        super().do_action()
-
         self.hero.map.ghosts.set_on(self.action_x, self.action_y, 1)
 
+    def add_payload(self):
+        """Agrega los eventos de la acción al json del turno."""
+
         agent = {
             "x": self.current_x,
             "y": self.current_y,
@@ -546,8 +556,6 @@ class ScareGhost(Action):
         self.hero.json["agents"].append(agent)
         self.hero.json["ghosts"].append(ghost)
 
-        return True
-
 class RemoveGhost(Action):
     """Remueve un fantasma alrededor del héroe."""
 
@@ -557,18 +565,20 @@ class RemoveGhost(Action):
 
         self.update_coords()
 
-        if not (self.action_x, self.action_y) in self.hero.map.walls.get_neighbors(self.current_x, self.current_y) and (self.action_x, self.action_y) != (self.current_x, self.current_y):
+        # Solo en su casilla o hacia una vecina accesible
+        if self.direction != self.SAME and not self.hero.map.walls.is_open(self.current_x, self.current_y, self.direction):
             return False
 
         return super().is_possible()
 
-    def do_action(self):
+    def apply(self):
         """Remueve el fantasma."""
 
-        super().do_action()
-
         self.hero.map.ghosts.set_on(self.action_x, self.action_y, 0)
 
+    def add_payload(self):
+        """Agrega los eventos de la acción al json del turno."""
+
         agent = {
             "x": self.current_x,
             "y": self.current_y,
@@ -589,8 +599,6 @@ class RemoveGhost(Action):
         self.hero.json["agents"].append(agent)
         self.hero.json["ghosts"].append(ghost)
 
-        return True
-
 class DoNothing(Action):
     """Guarda los puntos de acción restantes del héroe
     con intención de iniciar el siguiente turno.
@@ -599,14 +607,15 @@ class DoNothing(Action):
     def is_possible(self):
         return super().is_possible()
 
-    def do_action(self):
+    def apply(self):
         """Guarda los puntos de acción."""
 
-        super().do_action()
-
         self.hero.stored_action_points = min(self.hero.action_points, 4)
         self.hero.action_points = 0
 
+    def add_payload(self):
+        """Agrega los eventos de la acción al json del turno."""
+
         agent = {
             "x": self.current_x,
             "y": self.current_y,
@@ -618,5 +627,3 @@ class DoNothing(Action):
         }
 
         self.hero.json["agents"].append(agent)
-
-        return True
\ No newline at end of file
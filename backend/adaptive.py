@@ -0,0 +1,110 @@
+from imports import *
+
+import math
+import multiprocessing
+
+from runner import RunSummary, game_seed, play_game, default_chunksize
+
+from typing import TYPE_CHECKING
+if TYPE_CHECKING:
+    from results import *
+
+def wilson_interval(wins, games, z=1.96):
+    """Calcula el intervalo de confianza de Wilson para el porcentaje de victorias.
+
+    Args:
+        wins (int): Las partidas ganadas.
+        games (int): Las partidas jugadas.
+        z (float): El cuantil de la normal, 1.96 para el 95%.
+
+    Returns:
+        tuple[float, float]: El límite inferior y superior, en porcentaje.
+    """
+
+    if games == 0:
+        return (0, 100)
+
+    rate = wins / games
+    denominator = 1 + z * z / games
+    center = (rate + z * z / (2 * games)) / denominator
+    margin = z * math.sqrt(rate * (1 - rate) / games + z * z / (4 * games * games)) / denominator
+
+    return (max(0, center - margin) * 100, min(1, center + margin) * 100)
+
+def is_settled(summary: RunSummary, max_games, threshold, width, z):
+    """Verifica si ya no hace falta jugar más partidas de la corrida.
+
+    Una corrida se detiene cuando su intervalo es más angosto que width,
+    cuando el intervalo queda completamente debajo de threshold o cuando
+    llega a las partidas de una corrida de tamaño fijo.
+    """
+
+    if summary.played >= max_games:
+        return True
+
+    (low, high) = wilson_interval(summary.wins, summary.played, z)
+
+    return high - low <= width or high < threshold
+
+def run_adaptive(runs, naive, seed=None, max_games=100, threshold=10, width=10, z=1.96, step=10, sink: "ResultSink"=None, processes=None, profile=False):
+    """Juega las corridas por muestreo secuencial, cada una solo hasta que
+    su porcentaje de victorias queda suficientemente estimado.
+
+    Todas las corridas pendientes avanzan juntas en oleadas de step partidas,
+    así el pool siempre tiene trabajo. La partida i de la corrida j usa la misma
+    semilla que en run_batch, por lo que los resultados son comparables con
+    una corrida de tamaño fijo.
+
+    Args:
+        runs (int): La cantidad de corridas.
+        naive (bool): Bandera que dicta si las partidas son naive o con strat.
+        seed (int): La semilla base del lote, None para usar una aleatoria.
+        max_games (int): El tamaño de la corrida fija a la que se compara.
+        threshold (float): El porcentaje de victorias que interesa.
+        width (float): El ancho del intervalo, en puntos porcentuales, para detenerse.
+        z (float): El cuantil de la normal del intervalo.
+        step (int): Las partidas que se agregan a cada corrida por oleada.
+        sink (ResultSink): Donde guardar el registro de cada partida, opcional.
+        processes (int): Los procesos a usar, por defecto todos los núcleos.
+        profile (bool): Si se miden los tiempos por fase y se cuentan las
+            búsquedas, quedan en RunSummary.timings y RunSummary.search_stats.
+
+    Yields:
+        RunSummary: El resumen de cada corrida conforme se detiene.
+    """
+
+    if processes is None:
+        processes = multiprocessing.cpu_count()
+
+    if seed is None:
+        seed = np.random.SeedSequence().entropy
+
+    pending = [RunSummary(j, max_games) for j in range(runs)]
+
+    with multiprocessing.Pool(processes) as pool:
+        while pending:
+            # Las siguientes partidas de cada corrida pendiente
+            tasks = []
+            for summary in pending:
+                first = summary.run * max_games + summary.played
+                count = min(step, max_games - summary.played)
+                tasks.extend((naive, game_seed(seed, first + i), None, profile) for i in range(count))
+
+            outcomes = iter(pool.imap(play_game, tasks, default_chunksize(len(tasks), processes)))
+
+            still_pending = []
+            for summary in pending:
+                count = min(step, max_games - summary.played)
+                for _ in range(count):
+                    outcome = next(outcomes)
+                    summary.add(outcome)
+
+                    if sink is not None:
+                        sink.append(outcome)
+
+                if is_settled(summary, max_games, threshold, width, z):
+                    yield summary
+                else:
+                    still_pending.append(summary)
+
+            pending = still_pending
@@ -0,0 +1,102 @@
+from imports import *
+from search import UNREACHED
+
+from typing import TYPE_CHECKING
+if TYPE_CHECKING:
+    from search import *
+
+def hungarian(costs):
+    """Resuelve el problema de asignación con el método húngaro (Kuhn-Munkres),
+    en O(n^2 m).
+
+    Args:
+        costs (list[list[float]]): La matriz de costos de n x m, con n <= m.
+
+    Returns:
+        list[int]: La columna asignada a cada fila, de modo que la suma de
+            los costos es la mínima posible.
+    """
+
+    n = len(costs)
+    m = len(costs[0]) if n else 0
+
+    # Potenciales de filas y columnas, y la fila asignada a cada columna (0 es ninguna)
+    u = [0] * (n + 1)
+    v = [0] * (m + 1)
+    row_of = [0] * (m + 1)
+    way = [0] * (m + 1)
+
+    for row in range(1, n + 1):
+        row_of[0] = row
+        column = 0
+        min_reduced = [float("inf")] * (m + 1)
+        used = [False] * (m + 1)
+
+        # Busca el camino de aumento más barato desde la fila nueva
+        while True:
+            used[column] = True
+            current_row = row_of[column]
+            delta = float("inf")
+            next_column = 0
+
+            for j in range(1, m + 1):
+                if not used[j]:
+                    reduced = costs[current_row - 1][j - 1] - u[current_row] - v[j]
+                    if reduced < min_reduced[j]:
+                        min_reduced[j] = reduced
+                        way[j] = column
+                    if min_reduced[j] < delta:
+                        delta = min_reduced[j]
+                        next_column = j
+
+            for j in range(m + 1):
+                if used[j]:
+                    u[row_of[j]] += delta
+                    v[j] -= delta
+                else:
+                    min_reduced[j] -= delta
+
+            column = next_column
+            if row_of[column] == 0:
+                break
+
+        # Recorre el camino de aumento intercambiando las asignaciones
+        while column != 0:
+            previous = way[column]
+            row_of[column] = row_of[previous]
+            column = previous
+
+    assigned = [-1] * n
+    for j in range(1, m + 1):
+        if row_of[j] != 0:
+            assigned[row_of[j] - 1] = j - 1
+
+    return assigned
+
+def optimal_assignment(field: "PoiField"):
+    """Le asigna a cada POI un héroe distinto sin víctima, de modo que la
+    suma de las distancias sea la mínima. Si hay más POIs que héroes libres,
+    algunos POIs se quedan sin héroe; los héroes sobrantes no reciben POI.
+
+    Args:
+        field (PoiField): El campo con las distancias de los POIs.
+
+    Returns:
+        dict[int, int]: El índice del POI de cada héroe con uno asignado.
+    """
+
+    heroes = [hero for hero in field.map.heroes_array if not hero.has_victim]
+    if not heroes or not field.get_matrices():
+        return {}
+
+    # Filas: POIs, columnas: héroes
+    costs = [[matrix.cost(hero.x, hero.y) for hero in heroes] for matrix in field.get_matrices()]
+
+    if len(costs) <= len(heroes):
+        pairs = [(poi_id, hero_index) for (poi_id, hero_index) in enumerate(hungarian(costs))]
+    else:
+        transposed = [list(column) for column in zip(*costs)]
+        pairs = [(poi_id, hero_index) for (hero_index, poi_id) in enumerate(hungarian(transposed))]
+
+    # No se manda a un héroe a un POI al que no puede llegar
+    return {heroes[hero_index].id: poi_id for (poi_id, hero_index) in pairs if costs[poi_id][hero_index] < UNREACHED}
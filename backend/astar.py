@@ -0,0 +1,178 @@
+from imports import *
+from search import neigbors_with_cost, SearchResult, UNREACHED
+
+from typing import TYPE_CHECKING
+if TYPE_CHECKING:
+    from map import *
+
+def min_edge_cost(map: "Map", movement_type):
+    """Regresa el costo más chico que puede tener un paso, para que la
+    heurística de Manhattan nunca sobreestime.
+
+    Un paso cuesta 1, 2 (puerta) o el multiplicador dividido hasta 4 veces
+    entre ghost_divisor (uno por cada vecino con fantasma).
+    """
+
+    strategy = map.strategy
+
+    multiplier = 1
+    if movement_type == 2:
+        multiplier = strategy.ghost_multiplier
+
+    return min([1] + [multiplier / strategy.ghost_divisor ** i for i in range(5)])
+
+def astar(map: "Map", start_x, start_y, end_x, end_y, movement_type):
+    """Busca el camino más barato entre dos casillas con A*.
+
+    La heurística es la distancia Manhattan por min_edge_cost, que es
+    admisible y consistente, así que cada casilla se expande una sola vez y
+    la búsqueda termina al expandir el destino. Entre caminos del mismo costo
+    puede elegir otro que dijkstra.
+
+    Returns:
+        SearchResult: Los costos y padres de las casillas visitadas.
+    """
+
+    height = len(map.ghosts.dashboard)
+    size = height * len(map.ghosts.dashboard[0])
+
+    costs = [UNREACHED] * size
+    parents = [-1] * size
+    settled = bytearray(size)
+
+    scale = min_edge_cost(map, movement_type)
+
+    start = start_x * height + start_y
+    goal = end_x * height + end_y
+    costs[start] = 0
+    left_to_visit = [((abs(end_x - start_x) + abs(end_y - start_y)) * scale, start)]
+    expanded = 0
+    stale = 0
+
+    while left_to_visit:
+        (_, current) = heapq.heappop(left_to_visit)
+
+        if settled[current]:
+            stale += 1
+            continue
+        settled[current] = 1
+        expanded += 1
+
+        if current == goal:
+            break
+
+        current_cost = costs[current]
+        (current_x, current_y) = divmod(current, height)
+
+        for (x, y, cost) in neigbors_with_cost(map, current_x, current_y, movement_type):
+            neighbor = x * height + y
+
+            if current_cost + cost < costs[neighbor]:
+                costs[neighbor] = current_cost + cost
+                parents[neighbor] = current
+                heapq.heappush(left_to_visit, (costs[neighbor] + (abs(end_x - x) + abs(end_y - y)) * scale, neighbor))
+
+    pushed = expanded + stale + len(left_to_visit)
+    return SearchResult(start_x, start_y, height, costs, parents, expanded, stale, pushed)
+
+def bidirectional_dijkstra(map: "Map", start_x, start_y, end_x, end_y, movement_type):
+    """Busca el camino más barato entre dos casillas con dos dijkstra, uno
+    desde cada extremo.
+
+    El costo de un paso depende de la casilla de la que se sale, así que la
+    búsqueda hacia atrás usa el costo del vecino hacia la casilla actual.
+    Se detiene cuando la suma de los dos frentes ya no puede mejorar el
+    mejor camino encontrado.
+
+    Returns:
+        SearchResult: Los costos y padres del camino encontrado; las demás
+            casillas solo tienen valores tentativos.
+    """
+
+    height = len(map.ghosts.dashboard)
+    size = height * len(map.ghosts.dashboard[0])
+    walls = map.walls
+
+    start = start_x * height + start_y
+    goal = end_x * height + end_y
+
+    forward_costs = [UNREACHED] * size
+    backward_costs = [UNREACHED] * size
+    parents = [-1] * size
+    following = [-1] * size # La siguiente casilla hacia el destino
+    forward_settled = bytearray(size)
+    backward_settled = bytearray(size)
+
+    forward_costs[start] = 0
+    backward_costs[goal] = 0
+    forward = [(0, start)]
+    backward = [(0, goal)]
+    expanded = 0
+    stale = 0
+
+    # Los costos de salida de cada casilla, compartidos por ambos frentes
+    outgoing = {}
+    def edges(cell):
+        if cell not in outgoing:
+            (x, y) = divmod(cell, height)
+            outgoing[cell] = {neighbor_x * height + neighbor_y: cost for (neighbor_x, neighbor_y, cost) in neigbors_with_cost(map, x, y, movement_type)}
+        return outgoing[cell]
+
+    best = UNREACHED
+    meeting = None # El paso (u, v) donde se juntan los dos frentes
+
+    if start == goal:
+        return SearchResult(start_x, start_y, height, forward_costs, parents, expanded)
+
+    while forward and backward and forward[0][0] + backward[0][0] < best:
+        if forward[0][0] <= backward[0][0]:
+            (current_cost, current) = heapq.heappop(forward)
+            if forward_settled[current]:
+                stale += 1
+                continue
+            forward_settled[current] = 1
+            expanded += 1
+
+            for (neighbor, cost) in edges(current).items():
+                if current_cost + cost < forward_costs[neighbor]:
+                    forward_costs[neighbor] = current_cost + cost
+                    parents[neighbor] = current
+                    heapq.heappush(forward, (forward_costs[neighbor], neighbor))
+
+                if current_cost + cost + backward_costs[neighbor] < best:
+                    best = current_cost + cost + backward_costs[neighbor]
+                    meeting = (current, neighbor)
+        else:
+            (current_cost, current) = heapq.heappop(backward)
+            if backward_settled[current]:
+                stale += 1
+                continue
+            backward_settled[current] = 1
+            expanded += 1
+
+            (x, y) = divmod(current, height)
+            for (neighbor_x, neighbor_y) in walls.open_neighbors[y][x] + walls.door_neighbors[y][x]:
+                neighbor = neighbor_x * height + neighbor_y
+                cost = edges(neighbor).get(current)
+                if cost is None:
+                    continue
+
+                if current_cost + cost < backward_costs[neighbor]:
+                    backward_costs[neighbor] = current_cost + cost
+                    following[neighbor] = current
+                    heapq.heappush(backward, (backward_costs[neighbor], neighbor))
+
+                if forward_costs[neighbor] + cost + current_cost < best:
+                    best = forward_costs[neighbor] + cost + current_cost
+                    meeting = (neighbor, current)
+
+    # Se une la mitad de atrás a los padres para reconstruir como siempre
+    if meeting is not None:
+        (current, following_cell) = meeting
+        while current != goal:
+            parents[following_cell] = current
+            forward_costs[following_cell] = best - backward_costs[following_cell]
+            (current, following_cell) = (following_cell, following[following_cell])
+
+    pushed = expanded + stale + len(forward) + len(backward)
+    return SearchResult(start_x, start_y, height, forward_costs, parents, expanded, stale, pushed)
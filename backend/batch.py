@@ -0,0 +1,637 @@
+from imports import *
+
+from map import LOSS_NONE, LOSS_SCARED, LOSS_DAMAGE, LOSS_MAX_TURNS
+
+from typing import TYPE_CHECKING
+if TYPE_CHECKING:
+    from walls import *
+    from ghosts import *
+    from poi import *
+    from map import *
+
+# Direcciones: arriba, derecha, abajo, izquierda y la misma casilla
+DX = np.array([0, 1, 0, -1, 0])
+DY = np.array([-1, 0, 1, 0, 0])
+
+# Tipos de acción, en el mismo orden que el catálogo de acciones
+MOVE = 0
+MOVE_WITH_VICTIM = 1
+OPEN_DOOR = 2
+CLOSE_DOOR = 3
+DAMAGE_WALL = 4
+DESTROY_WALL = 5
+CLEAR_FOG = 6
+SCARE_GHOST = 7
+REMOVE_GHOST = 8
+DO_NOTHING = 9
+
+# Catálogo de todas las acciones posibles (tipo, dirección, puntos de acción),
+# equivalente a lo que puede regresar ActionList.generate_list
+ACTIONS = (
+    [(MOVE, d, 1) for d in range(4)] +
+    [(MOVE_WITH_VICTIM, d, 2) for d in range(4)] +
+    [(OPEN_DOOR, d, 1) for d in range(4)] +
+    [(CLOSE_DOOR, d, 1) for d in range(4)] +
+    [(DAMAGE_WALL, d, 2) for d in range(4)] +
+    [(DESTROY_WALL, d, 2) for d in range(4)] +
+    [(CLEAR_FOG, d, 1) for d in range(5)] +
+    [(SCARE_GHOST, d, 1) for d in range(5)] +
+    [(REMOVE_GHOST, d, 2) for d in range(5)] +
+    [(DO_NOTHING, 4, 0)]
+)
+ACTION_TYPE = np.array([action[0] for action in ACTIONS])
+ACTION_DIRECTION = np.array([action[1] for action in ACTIONS])
+ACTION_COST = np.array([action[2] for action in ACTIONS])
+
+class BatchEngine:
+    """Juega N partidas naive al mismo tiempo sobre matrices de NumPy.
+
+    Todas las partidas avanzan juntas un turno de héroe a la vez. El estado
+    de cada partida vive en matrices apiladas:
+        - ghosts: N x 8 x 10, igual que Ghosts.dashboard
+        - vertical, horizontal: N x 8 x 10, igual que Walls
+        - pois: N x 8 x 10, igual que POI.dashboard
+        - heroes: N x 6 x 2, las coordenadas (x, y) de cada héroe
+
+    Las reglas son las de Hero.step con la simulación naive, Ghosts.place_fog,
+    Ghosts.arise y Map.game_over, incluidas sus particularidades. Las partidas
+    que terminan se quedan fuera de la máscara active. Como los números
+    aleatorios salen de un solo generador, los resultados coinciden con Map
+    en distribución, no partida por partida.
+    """
+
+    def __init__(self, games, seed=None, strategy=None):
+        """Inicializa las N partidas con el tablero inicial de Map.
+
+        Args:
+            games (int): La cantidad de partidas.
+            seed (int): La semilla del lote, None para usar una aleatoria.
+            strategy (Strategy): Los parámetros, de los que solo se usa
+                spawn_distance; por defecto Strategy().
+        """
+
+        self.games = games
+        self.rng = np.random.default_rng(seed)
+
+        if strategy is None:
+            strategy = Strategy()
+        self.strategy = strategy
+
+        # El tablero inicial se toma de las mismas clases que usa Map
+        template = Map(True, 0)
+
+        self.ghosts = np.repeat(np.array(template.ghosts.dashboard, dtype=np.int8)[None], games, axis=0)
+        self.vertical = np.repeat(np.array(template.walls.vertical, dtype=np.float32)[None], games, axis=0)
+        self.horizontal = np.repeat(np.array(template.walls.horizontal, dtype=np.float32)[None], games, axis=0)
+        self.pois = np.repeat(np.array(template.poi.dashboard, dtype=np.int8)[None], games, axis=0)
+        self.heroes = np.repeat(np.array(template.initial_positions, dtype=np.int64)[None], games, axis=0)
+
+        self.has_victim = np.zeros((games, 6), dtype=bool)
+        self.stored_action_points = np.zeros((games, 6), dtype=np.int64)
+
+        # Los POIs sin revelar que quedan de cada tipo
+        self.victims_left = np.full(games, np.count_nonzero(template.poi.poi_list == 4))
+        self.false_alarms_left = np.full(games, np.count_nonzero(template.poi.poi_list == 5))
+
+        self.current = np.full(games, template.poi.current)
+        self.rescued = np.zeros(games, dtype=np.int64)
+        self.scared = np.zeros(games, dtype=np.int64)
+        self.damage_points = np.zeros(games, dtype=np.int64)
+        self.num_steps = np.zeros(games, dtype=np.int64)
+        self.win = np.zeros(games, dtype=bool)
+        self.active = np.ones(games, dtype=bool)
+
+        self.current_hero = 0
+
+        self.spawn_points = np.array(template.spawn_points, dtype=np.int64)
+
+        # El spawn point más cercano (manhattan) de cada casilla, lo que usa
+        # to_closest_spawn_point con "manhattan" o cuando no se puede llegar
+        # caminando a ninguno
+        self.closest_spawn = np.zeros((8, 10, 2), dtype=np.int64)
+        for y in range(8):
+            for x in range(10):
+                closest = (0, 0, 1000)
+                for spawn_point in template.spawn_points:
+                    distance = abs(spawn_point[0] - x) + abs(spawn_point[1] - y)
+                    if distance < closest[2]:
+                        closest = (spawn_point[0], spawn_point[1], distance)
+                self.closest_spawn[y, x] = closest[:2]
+
+    # Getters vectorizados, con los mismos límites que Walls y Ghosts
+    def get_wall(self, g, x, y, direction):
+        """Regresa el valor de la pared en la dirección dada, como Walls.get_*."""
+
+        if direction == 0:
+            inside = (y > 0) & (y < 8)
+            value = self.horizontal[g, np.clip(y - 1, 0, 7), x]
+        elif direction == 1:
+            inside = x < 9
+            value = self.vertical[g, y, np.clip(x, 0, 9)]
+        elif direction == 2:
+            inside = y < 7
+            value = self.horizontal[g, np.clip(y, 0, 7), x]
+        else:
+            inside = x > 0
+            value = self.vertical[g, y, np.clip(x - 1, 0, 9)]
+
+        return np.where(inside, value, -1)
+
+    def walking_distances(self, g, x, y):
+        """Calcula la distancia caminando desde (x, y) hasta cada casilla de
+        cada partida de g, como Walls.walking_distances.
+
+        Returns:
+            np.ndarray: len(g) x 8 x 10, inf donde no se puede llegar.
+        """
+
+        cells_y = np.arange(8)[:, None]
+        cells_x = np.arange(10)[None, :]
+
+        # Lo que cuesta entrar a cada casilla desde su vecino en cada dirección
+        costs = []
+        for d in range(4):
+            wall = self.get_wall(g[:, None, None], cells_x, cells_y, d)
+            free = (wall == 0) | (wall == 2) | (wall == 4)
+            costs.append(np.where(free, 1.0, np.where(wall == 3, 2.0, np.inf)))
+
+        distances = np.full((len(g), 8, 10), np.inf)
+        distances[np.arange(len(g)), y, x] = 0
+
+        # Se relajan todas las casillas a la vez hasta que ya no cambie nada;
+        # en los bordes el costo es inf, así que no importa que roll dé la vuelta
+        while True:
+            relaxed = distances
+            for d in range(4):
+                neighbor = np.roll(distances, (-DY[d], -DX[d]), axis=(1, 2))
+                relaxed = np.minimum(relaxed, neighbor + costs[d])
+
+            if np.array_equal(relaxed, distances):
+                return distances
+            distances = relaxed
+
+    def closest_spawn_walking(self, g, x, y):
+        """Regresa el spawn point más cercano caminando desde (x, y) en cada
+        partida de g, como Hero.to_closest_spawn_point.
+        """
+
+        distances = self.walking_distances(g, x, y)[:, self.spawn_points[:, 1], self.spawn_points[:, 0]]
+
+        # argmin regresa el primero en empate, igual que la comparación estricta
+        closest = self.spawn_points[np.argmin(distances, axis=1)]
+        reachable = np.isfinite(distances.min(axis=1))
+
+        return np.where(reachable[:, None], closest, self.closest_spawn[y, x])
+
+    def set_wall(self, g, x, y, direction, value):
+        """Asigna el valor de la pared en la dirección dada, como Walls.set_*."""
+
+        if direction == 0:
+            self.horizontal[g, y - 1, x] = value
+        elif direction == 1:
+            self.vertical[g, y, x] = value
+        elif direction == 2:
+            self.horizontal[g, y, x] = value
+        else:
+            self.vertical[g, y, x - 1] = value
+
+    def get_ghost(self, g, x, y, direction):
+        """Regresa el valor de la casilla vecina, con los límites de Ghosts.get_*."""
+
+        if direction == 0:
+            inside = (y > 1) & (y < 7)
+        elif direction == 1:
+            inside = (x > 0) & (x < 8)
+        elif direction == 2:
+            inside = (y > 0) & (y < 6)
+        elif direction == 3:
+            inside = (x > 1) & (x < 9)
+        else:
+            return self.ghosts[g, y, x]
+
+        value = self.ghosts[g, np.clip(y + DY[direction], 0, 7), np.clip(x + DX[direction], 0, 9)]
+        return np.where(inside, value, -1)
+
+    def hero_on(self, g, x, y):
+        """Verifica si algún héroe está en la casilla (x, y) de cada partida."""
+
+        return ((self.heroes[g, :, 0] == x[:, None]) & (self.heroes[g, :, 1] == y[:, None])).any(axis=1)
+
+    # POIs
+    def pick(self, g):
+        """Revela un POI de cada partida de g, como POI.pick.
+
+        Returns:
+            np.ndarray: 4 si es víctima, 5 si es falsa alarma, -1 si ya no hay POIs.
+        """
+
+        victims = self.victims_left[g]
+        total = victims + self.false_alarms_left[g]
+
+        is_victim = self.rng.random(len(g)) * np.maximum(total, 1) < victims
+        value = np.where(total == 0, -1, np.where(is_victim, 4, 5))
+
+        self.victims_left[g] -= (value == 4)
+        self.false_alarms_left[g] -= (value == 5)
+
+        return value
+
+    def place_ghost(self, g, x, y):
+        """Coloca fantasmas en las casillas dadas, como Ghosts.place_ghost.
+
+        Puede recibir varias casillas de la misma partida.
+        """
+
+        self.ghosts[g, y, x] = 2
+
+        has_poi = self.pois[g, y, x] >= 3
+        g = g[has_poi]
+        x = x[has_poi]
+        y = y[has_poi]
+
+        # Se procesan por rondas para que cada partida revele un POI a la vez
+        while len(g) > 0:
+            (_, first) = np.unique(g, return_index=True)
+            rest = np.ones(len(g), dtype=bool)
+            rest[first] = False
+
+            (fg, fx, fy) = (g[first], x[first], y[first])
+            value = self.pois[fg, fy, fx].astype(np.int64)
+
+            hidden = value == 3
+            value[hidden] = self.pick(fg[hidden])
+
+            self.scared[fg] += (value == 4)
+            self.current[fg] -= 1
+            self.pois[fg, fy, fx] = 0
+
+            (g, x, y) = (g[rest], x[rest], y[rest])
+
+    # Turno de los héroes
+    def possible_actions(self, g, h, action_points):
+        """Calcula qué acciones del catálogo puede hacer el héroe h de cada partida de g.
+
+        Returns:
+            np.ndarray: Matriz len(g) x len(ACTIONS) con las acciones posibles.
+        """
+
+        x = self.heroes[g, h, 0]
+        y = self.heroes[g, h, 1]
+        has_victim = self.has_victim[g, h]
+        ghost_on = self.ghosts[g, y, x]
+
+        # Lo que rodea al héroe en cada dirección, la 4 es su propia casilla
+        walls = [self.get_wall(g, x, y, d) for d in range(4)] + [np.full(len(g), -1)]
+        ghosts = [self.get_ghost(g, x, y, d) for d in range(5)]
+        free = [(wall == 0) | (wall == 2) | (wall == 4) for wall in walls[:4]] + [np.ones(len(g), dtype=bool)]
+
+        inside = []
+        targets = []
+        for d in range(5):
+            target_x = x + DX[d]
+            target_y = y + DY[d]
+            inside.append((target_x >= 0) & (target_x <= 9) & (target_y >= 0) & (target_y <= 7))
+            targets.append(self.ghosts[g, np.clip(target_y, 0, 7), np.clip(target_x, 0, 9)])
+
+        possible = np.zeros((len(g), len(ACTIONS)), dtype=bool)
+
+        for (i, (action_type, d, cost)) in enumerate(ACTIONS):
+            if action_type == DO_NOTHING:
+                possible[:, i] = ghost_on != 2
+                continue
+
+            if action_type == MOVE:
+                allowed = ~has_victim & free[d] & (ghosts[d] != 2)
+            elif action_type == MOVE_WITH_VICTIM:
+                allowed = has_victim & free[d] & (targets[d] != 2)
+            elif action_type == OPEN_DOOR:
+                allowed = walls[d] == 3
+            elif action_type == CLOSE_DOOR:
+                allowed = walls[d] == 2
+            elif action_type == DAMAGE_WALL:
+                allowed = walls[d] == 1
+            elif action_type == DESTROY_WALL:
+                allowed = walls[d] == 0.5
+            elif action_type == CLEAR_FOG:
+                allowed = free[d] & (ghosts[d] == 1)
+            else: # Ahuyentar o remover fantasma
+                allowed = free[d] & (ghosts[d] == 2)
+
+            possible[:, i] = allowed & inside[d] & (action_points >= cost)
+
+        return possible
+
+    def do_actions(self, g, h, choice, action_points, stored):
+        """Realiza la acción elegida por el héroe h de cada partida de g.
+
+        Returns:
+            np.ndarray: Los puntos de acción restantes.
+        """
+
+        action_type = ACTION_TYPE[choice]
+        direction = ACTION_DIRECTION[choice]
+        action_points = action_points - ACTION_COST[choice]
+
+        x = self.heroes[g, h, 0]
+        y = self.heroes[g, h, 1]
+        target_x = x + DX[direction]
+        target_y = y + DY[direction]
+
+        # Movimientos
+        moves = (action_type == MOVE) | (action_type == MOVE_WITH_VICTIM)
+        self.heroes[g[moves], h, 0] = target_x[moves]
+        self.heroes[g[moves], h, 1] = target_y[moves]
+
+        saved = (action_type == MOVE_WITH_VICTIM) & ((target_x == 0) | (target_x == 9) | (target_y == 0) | (target_y == 7))
+        self.rescued[g[saved]] += 1
+        self.has_victim[g[saved], h] = False
+        self.current[g[saved]] -= 1
+
+        # Puertas y paredes
+        for (action, value) in [(OPEN_DOOR, 2), (CLOSE_DOOR, 3), (DAMAGE_WALL, 0.5), (DESTROY_WALL, 0)]:
+            for d in range(4):
+                selected = (action_type == action) & (direction == d)
+                if selected.any():
+                    self.set_wall(g[selected], x[selected], y[selected], d, value)
+
+        damaged = (action_type == DAMAGE_WALL) | (action_type == DESTROY_WALL)
+        self.damage_points[g[damaged]] += 1
+
+        # Niebla y fantasmas
+        for (action, value) in [(CLEAR_FOG, 0), (SCARE_GHOST, 1), (REMOVE_GHOST, 0)]:
+            selected = action_type == action
+            self.ghosts[g[selected], target_y[selected], target_x[selected]] = value
+
+        # Esperar guarda los puntos restantes y termina el turno
+        waits = action_type == DO_NOTHING
+        stored[waits] = np.minimum(action_points[waits], 4)
+        action_points[waits] = 0
+
+        return action_points
+
+    def check_pois(self, g, h):
+        """Revela o levanta el POI donde está el héroe h, como al final de
+        cada acción de Hero.step.
+        """
+
+        x = self.heroes[g, h, 0]
+        y = self.heroes[g, h, 1]
+        value = self.pois[g, y, x]
+
+        # POI sin revelar
+        hidden = value == 3
+        (hg, hx, hy) = (g[hidden], x[hidden], y[hidden])
+        revealed = self.pick(hg)
+        self.pois[hg, hy, hx] = np.where(revealed == -1, 3, revealed)
+
+        victim = revealed == 4
+        hold = victim & ~self.has_victim[hg, h]
+        self.has_victim[hg[hold], h] = True
+        self.pois[hg[hold], hy[hold], hx[hold]] = 0
+
+        removed = ~victim
+        self.current[hg[removed]] -= 1
+        self.pois[hg[removed], hy[removed], hx[removed]] = 0
+
+        # Víctima que alguien más reveló y nadie levantó
+        waiting = (value == 4) & ~self.has_victim[g, h]
+        self.has_victim[g[waiting], h] = True
+        self.pois[g[waiting], y[waiting], x[waiting]] = 0
+
+    def heroes_turn(self, g, h):
+        """Realiza las acciones naive del héroe h en cada partida de g."""
+
+        stored = self.stored_action_points[g, h].copy()
+        action_points = stored + 4
+
+        playing = action_points > 0
+        while playing.any():
+            pg = g[playing]
+
+            possible = self.possible_actions(pg, h, action_points[playing])
+
+            # Una acción al azar entre las posibles, como el shuffle de Hero.step
+            scores = self.rng.random(possible.shape)
+            scores[~possible] = -1
+            choice = scores.argmax(axis=1)
+
+            playing_stored = stored[playing]
+            action_points[playing] = self.do_actions(pg, h, choice, action_points[playing], playing_stored)
+            stored[playing] = playing_stored
+
+            self.check_pois(pg, h)
+
+            playing = action_points > 0
+
+        self.stored_action_points[g, h] = stored
+
+    # Turno de los fantasmas
+    def arise(self, g, x, y):
+        """Realiza la oleada de fantasmas desde (x, y) en cada partida de g, como Ghosts.arise.
+
+        Returns:
+            np.ndarray: El daño agregado en cada partida.
+        """
+
+        added_damage = np.zeros(len(g), dtype=np.int64)
+
+        for direction in range(4):
+            current_x = x.copy()
+            current_y = y.copy()
+            alive = np.ones(len(g), dtype=bool)
+
+            while alive.any():
+                new_x = current_x + DX[direction]
+                new_y = current_y + DY[direction]
+                out_of_bounds = (new_x < 0) | (new_x > 9) | (new_y < 0) | (new_y > 7)
+
+                value = self.get_wall(g, current_x, current_y, direction)
+                alive &= (value != -1) & ~out_of_bounds
+
+                # Pasa, daña, destruye o termina la propagación según el valor
+                can_end = alive & ((value == 0.5) | (value == 1) | (value == 3))
+                set_value = np.select([value == 0.5, value == 1, value == 2, value == 3], [0, 0.5, 4, 4], -1)
+
+                # Igual que Ghosts.arise, una puerta destruida queda en -1
+                changes = alive & (value > 0)
+                if changes.any():
+                    self.set_wall(g[changes], current_x[changes], current_y[changes], direction, set_value[changes])
+
+                added_damage += alive & ((value == 0.5) | (value == 1))
+                alive &= ~can_end
+
+                # Si la siguiente casilla ya tiene fantasma, la oleada continúa
+                cell = self.ghosts[g, np.clip(new_y, 0, 7), np.clip(new_x, 0, 9)]
+                stops = alive & (cell != 2)
+                if stops.any():
+                    self.place_ghost(g[stops], new_x[stops], new_y[stops])
+
+                alive &= ~stops
+                current_x = np.where(alive, new_x, current_x)
+                current_y = np.where(alive, new_y, current_y)
+
+        return added_damage
+
+    def spread_ghosts(self, g):
+        """Convierte en fantasma la niebla conectada a fantasmas hasta que no
+        haya cambios, como el ciclo de spread_ghost en Ghosts.place_fog.
+        """
+
+        vertical = self.vertical[g]
+        horizontal = self.horizontal[g]
+
+        # Pasos abiertos, igual que Walls.get_neighbors
+        open_right = (vertical == 0) | (vertical == 2) | (vertical == 4)
+        open_right[:, :, 9] = False
+        open_down = (horizontal == 0) | (horizontal == 2) | (horizontal == 4)
+        open_down[:, 7, :] = False
+
+        layer = self.ghosts[g]
+        fog = layer == 1
+        ghosts = layer == 2
+        spread = np.zeros_like(fog)
+
+        # Las paredes no cambian al propagarse, así que se itera solo sobre las
+        # matrices locales de las partidas que siguen cambiando
+        changing = np.arange(len(g))
+        while len(changing) > 0:
+            ghost = ghosts[changing]
+            right = open_right[changing]
+            down = open_down[changing]
+
+            near_ghost = np.zeros_like(ghost)
+            near_ghost[:, :, :-1] |= right[:, :, :-1] & ghost[:, :, 1:]
+            near_ghost[:, :, 1:] |= right[:, :, :-1] & ghost[:, :, :-1]
+            near_ghost[:, :-1, :] |= down[:, :-1, :] & ghost[:, 1:, :]
+            near_ghost[:, 1:, :] |= down[:, :-1, :] & ghost[:, :-1, :]
+
+            spreading = fog[changing] & near_ghost
+
+            ghosts[changing] |= spreading
+            fog[changing] &= ~spreading
+            spread[changing] |= spreading
+
+            changing = changing[spreading.any(axis=(1, 2))]
+
+        (game, y, x) = np.nonzero(spread)
+        if len(game) > 0:
+            self.place_ghost(g[game], x, y)
+
+    def place_fog(self, g):
+        """Coloca la niebla del turno en cada partida de g, como Ghosts.place_fog.
+
+        Returns:
+            np.ndarray: El daño agregado en cada partida.
+        """
+
+        x = self.rng.integers(1, 9, len(g))
+        y = self.rng.integers(1, 7, len(g))
+        cell = self.ghosts[g, y, x]
+
+        empty = cell == 0
+        self.ghosts[g[empty], y[empty], x[empty]] = 1
+
+        foggy = cell == 1
+        self.place_ghost(g[foggy], x[foggy], y[foggy])
+
+        added_damage = np.zeros(len(g), dtype=np.int64)
+        ghostly = cell == 2
+        added_damage[ghostly] = self.arise(g[ghostly], x[ghostly], y[ghostly])
+
+        self.spread_ghosts(g)
+
+        return added_damage
+
+    def place_pois(self, g):
+        """Repone POIs hasta tener 3 en cada partida de g, como POI.place."""
+
+        missing = g[self.current[g] < 3]
+
+        while len(missing) > 0:
+            x = self.rng.integers(1, 9, len(missing))
+            y = self.rng.integers(1, 7, len(missing))
+
+            # Igual que POI.place, solo se rechaza la casilla si tiene POI y héroe
+            accepted = (self.pois[missing, y, x] == 0) | ~self.hero_on(missing, x, y)
+            (ag, ax, ay) = (missing[accepted], x[accepted], y[accepted])
+
+            self.pois[ag, ay, ax] = 3
+            cleared = (self.ghosts[ag, ay, ax] == 1) | (self.ghosts[ag, ay, ax] == 2)
+            self.ghosts[ag[cleared], ay[cleared], ax[cleared]] = 0
+            self.current[ag] += 1
+
+            missing = g[self.current[g] < 3]
+
+    def knock_back(self, g):
+        """Manda al spawn point a los héroes que quedaron en un fantasma."""
+
+        for h in range(6):
+            x = self.heroes[g, h, 0]
+            y = self.heroes[g, h, 1]
+            hit = self.ghosts[g, y, x] == 2
+            hg = g[hit]
+
+            scared = self.has_victim[hg, h]
+            self.scared[hg[scared]] += 1
+            self.current[hg[scared]] -= 1
+            self.has_victim[hg, h] = False
+
+            if self.strategy.spawn_distance != "walking":
+                self.heroes[hg, h] = self.closest_spawn[y[hit], x[hit]]
+            elif len(hg) > 0:
+                self.heroes[hg, h] = self.closest_spawn_walking(hg, x[hit], y[hit])
+            self.stored_action_points[hg, h] = 0
+
+    def check_game_over(self):
+        """Termina las partidas que se ganaron o perdieron, como Map.game_over."""
+
+        won = self.active & (self.rescued >= 7)
+        lost = self.active & ~won & ((self.scared >= 4) | (self.damage_points >= 24))
+
+        self.win |= won
+        self.damage_points[lost] = np.minimum(self.damage_points[lost], 24)
+        self.active &= ~(won | lost)
+
+    def turn(self):
+        """Realiza el turno del próximo héroe en todas las partidas activas."""
+
+        g = np.flatnonzero(self.active)
+        h = self.current_hero
+
+        if len(g) > 0:
+            self.heroes_turn(g, h)
+            self.damage_points[g] += self.place_fog(g)
+            self.place_pois(g)
+            self.knock_back(g)
+            self.num_steps[g] += 1
+
+        self.current_hero = (self.current_hero + 1) % 6
+        self.check_game_over()
+
+    def run(self, max_turns=None):
+        """Juega hasta que terminen todas las partidas o se llegue a max_turns.
+
+        Returns:
+            dict[str, np.ndarray]: Los resultados de cada partida.
+        """
+
+        self.check_game_over()
+
+        turns = 0
+        while self.active.any() and (max_turns is None or turns < max_turns):
+            self.turn()
+            turns += 1
+
+        loss_reason = np.full(self.games, LOSS_NONE)
+        loss_reason[~self.win & ~self.active & (self.scared >= 4)] = LOSS_SCARED
+        loss_reason[~self.win & ~self.active & (self.damage_points >= 24)] = LOSS_DAMAGE
+        loss_reason[self.active] = LOSS_MAX_TURNS
+
+        return {
+            "win": self.win.copy(),
+            "rescued": self.rescued.copy(),
+            "scared": self.scared.copy(),
+            "damage_points": self.damage_points.copy(),
+            "num_steps": self.num_steps.copy(),
+            "loss_reason": loss_reason,
+        }
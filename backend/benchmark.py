@@ -0,0 +1,342 @@
+from imports import *
+
+import argparse
+import json
+import platform
+import sys
+import time
+
+from runner import game_seed
+from search import dijkstra, PoiField
+from astar import astar, bidirectional_dijkstra
+from batch import BatchEngine
+from assignment import optimal_assignment
+from relaxation import distance_fields
+from search_stats import merge_stats
+
+# Semilla del corpus, no cambiarla para que las corridas sean comparables
+BENCH_SEED = 2024
+
+def percentile(values, q):
+    """Regresa el percentil q de una lista de valores."""
+
+    return float(np.percentile(np.array(values), q))
+
+def time_calls(function, prepare, repeat):
+    """Mide cuánto tarda una función, sin contar su preparación.
+
+    Args:
+        function (callable): Recibe lo que regresa prepare.
+        prepare (callable): Recibe el número de repetición y regresa el argumento.
+        repeat (int): Las veces que se llama a la función.
+
+    Returns:
+        dict: El tiempo promedio, la mediana y el p99 en microsegundos.
+    """
+
+    samples = []
+    for i in range(repeat):
+        argument = prepare(i)
+
+        start = time.perf_counter_ns()
+        function(argument)
+        samples.append(time.perf_counter_ns() - start)
+
+    return {
+        "calls": repeat,
+        "mean_us": sum(samples) / len(samples) / 1000,
+        "median_us": percentile(samples, 50) / 1000,
+        "p99_us": percentile(samples, 99) / 1000
+    }
+
+def corpus_states(count, turns=12):
+    """Genera los tableros de la mitad de una partida con strat, siempre
+    los mismos para la misma BENCH_SEED.
+    """
+
+    states = []
+    for i in range(count):
+        simulation = Map(False, game_seed(BENCH_SEED, i))
+
+        for _ in range(turns):
+            if simulation.game_over():
+                break
+            simulation.turn()
+
+        states.append(simulation)
+
+    return states
+
+def bench_games(naive, games, payloads=True):
+    """Juega el corpus completo y mide el rendimiento de Map.turn()."""
+
+    latencies = []
+    turns = 0
+    rounds = 0
+    searches = 0
+    hits = 0
+    misses = 0
+
+    start = time.perf_counter()
+    for i in range(games):
+        simulation = Map(naive, game_seed(BENCH_SEED, i), payloads=payloads)
+
+        while not simulation.game_over():
+            turn_start = time.perf_counter_ns()
+            simulation.turn()
+            latencies.append(time.perf_counter_ns() - turn_start)
+            turns += 1
+
+        planning = simulation.planning.to_dict()
+        rounds += planning["rounds"]
+        searches += planning["searches"]
+        hits += simulation.path_cache.hits
+        misses += simulation.path_cache.misses
+    elapsed = time.perf_counter() - start
+
+    return {
+        "games": games,
+        "turns": turns,
+        "games_per_sec": games / elapsed,
+        "turns_per_sec": turns / elapsed,
+        "turn_mean_us": sum(latencies) / len(latencies) / 1000,
+        "turn_p99_us": percentile(latencies, 99) / 1000,
+        "searches_per_round": searches / rounds if rounds else 0,
+        "path_cache_hit_rate": hits / (hits + misses) * 100 if hits + misses else 0
+    }
+
+def bench_search_stats(games):
+    """Juega el corpus con strat contando las búsquedas, y regresa por
+    caller las búsquedas por partida, casillas sacadas por búsqueda, el
+    porcentaje de entradas viejas y el largo promedio de los caminos.
+    """
+
+    stats = {}
+    for i in range(games):
+        simulation = Map(False, game_seed(BENCH_SEED, i), profile=True, payloads=False)
+        simulation.run_to_completion()
+        merge_stats(stats, simulation.search_stats.to_dict())
+
+    results = {}
+    for (caller, counters) in stats.items():
+        results[caller + "_calls_per_game"] = counters["calls"] / games
+        results[caller + "_popped_per_call"] = counters["popped"] / counters["calls"] if counters["calls"] else 0
+        results[caller + "_stale_pct"] = counters["stale"] / counters["popped"] * 100 if counters["popped"] else 0
+        results[caller + "_path_length"] = counters["path_length"] / counters["paths"] if counters["paths"] else 0
+
+    return results
+
+def bench_completion(naive, games):
+    """Juega el corpus completo con Map.run_to_completion, sin payloads."""
+
+    turns = 0
+
+    start = time.perf_counter()
+    for i in range(games):
+        turns += Map(naive, game_seed(BENCH_SEED, i), payloads=False).run_to_completion().steps
+    elapsed = time.perf_counter() - start
+
+    return {
+        "games": games,
+        "turns": turns,
+        "games_per_sec": games / elapsed,
+        "turns_per_sec": turns / elapsed
+    }
+
+def exit_targets(map):
+    """Regresa las salidas como objetivos de dijkstra, igual que closest_exit."""
+
+    height = len(map.ghosts.dashboard)
+    return {exit[0] * height + exit[1]: 0 for exit in map.walls.exits}
+
+def bench_point_to_point(states, repeat):
+    """Compara las búsquedas entre dos casillas y la de la salida más cercana
+    contra el dijkstra completo, en tiempo y en casillas expandidas.
+    """
+
+    def query(i):
+        simulation = states[i % len(states)]
+        simulation.path_cache.clear()
+        return (simulation, (i * 7) % 10, (i * 3) % 8, (i * 5 + 3) % 10, (i * 11 + 1) % 8)
+
+    searches = {
+        "dijkstra": lambda task: dijkstra(task[0], task[1], task[2], 1),
+        "astar": lambda task: astar(*task, 1),
+        "bidirectional": lambda task: bidirectional_dijkstra(*task, 1),
+        "closest_exit_early": lambda task: dijkstra(task[0], task[1], task[2], 1, targets=exit_targets(task[0]))
+    }
+
+    results = {}
+    for (name, search) in searches.items():
+        results[name + "_mean_us"] = time_calls(search, query, repeat)["mean_us"]
+        results[name + "_expanded"] = sum(search(query(i)).expanded for i in range(100)) / 100
+
+    return results
+
+def bench_relaxation(states, repeat):
+    """Compara los campos de relaxation.py contra un dijkstra por origen,
+    para los héroes, los POIs y las salidas, y revisa que coincidan.
+    """
+
+    queries = {
+        "heroes": (lambda simulation: list(simulation.positions), 2),
+        "pois": (lambda simulation: list(simulation.poi.current_poi_coords), 2),
+        "exits": (lambda simulation: list(simulation.walls.exits), 1)
+    }
+
+    results = {}
+    for (name, (sources, movement_type)) in queries.items():
+        def prepare(i):
+            simulation = states[i % len(states)]
+            return (simulation, sources(simulation))
+
+        relaxed = time_calls(lambda task: distance_fields(task[0], task[1], movement_type), prepare, repeat)
+        fresh = time_calls(lambda task: [dijkstra(task[0], x, y, movement_type) for (x, y) in task[1]], prepare, repeat)
+
+        # La diferencia más grande entre ambos, sin contar las casillas inalcanzables
+        error = 0
+        for simulation in states:
+            fields = distance_fields(simulation, sources(simulation), movement_type)
+            for (field, (x, y)) in zip(fields, sources(simulation)):
+                costs = np.array(dijkstra(simulation, x, y, movement_type).costs, dtype=np.float64).reshape(field.shape[1], field.shape[0]).T
+                reached = np.isfinite(field)
+                error = max(error, float(np.abs(field[reached] - costs[reached]).max()))
+
+        results[name + "_relaxation_us"] = relaxed["mean_us"]
+        results[name + "_dijkstra_us"] = fresh["mean_us"]
+        results[name + "_max_error"] = error
+
+    return results
+
+def bench_batch_engine(games):
+    """Mide el motor vectorizado con el mismo número de partidas."""
+
+    start = time.perf_counter()
+    BatchEngine(games, BENCH_SEED).run()
+    elapsed = time.perf_counter() - start
+
+    return {"games": games, "games_per_sec": games / elapsed}
+
+def run_benchmarks(quick=False):
+    """Corre todo el conjunto de benchmarks.
+
+    Args:
+        quick (bool): Usa un corpus más chico para revisar rápido.
+
+    Returns:
+        dict: Los resultados de cada benchmark.
+    """
+
+    games = 20 if quick else 200
+    repeat = 200 if quick else 2000
+    states = corpus_states(10 if quick else 50)
+
+    def state(i):
+        simulation = states[i % len(states)]
+        simulation.path_cache.clear() # Para medir la búsqueda y no la caché
+        simulation.planning.clear()
+        return simulation
+
+    def fresh_state(i):
+        return copy.deepcopy(state(i))
+
+    def poi_field(i):
+        field = PoiField(state(i))
+        field.get_matrices() # Para medir solo la asignación
+        return field
+
+    def hero_state(i):
+        hero = state(i).heroes_array[i % 6]
+        hero.action_points = 4
+        return hero
+
+    results = {}
+    results["naive_games"] = bench_games(True, games)
+    results["strategic_games"] = bench_games(False, games)
+    results["naive_games_no_payloads"] = bench_games(True, games, False)
+    results["strategic_games_no_payloads"] = bench_games(False, games, False)
+    results["naive_run_to_completion"] = bench_completion(True, games)
+    results["strategic_run_to_completion"] = bench_completion(False, games)
+    results["batch_engine"] = bench_batch_engine(games * 10)
+    results["search_stats"] = bench_search_stats(games)
+    results["map_construction"] = time_calls(lambda seed: Map(False, seed), lambda i: game_seed(BENCH_SEED, i), repeat)
+
+    results["dijkstra"] = time_calls(
+        lambda simulation: dijkstra(simulation, simulation.heroes_array[0].x, simulation.heroes_array[0].y, 2),
+        state, repeat)
+    results["closest_poi"] = time_calls(lambda simulation: closest_poi(simulation, 1), state, repeat)
+    results["poi_assignment"] = time_calls(optimal_assignment, poi_field, repeat)
+    results["place_fog"] = time_calls(
+        lambda simulation: simulation.ghosts.place_fog({"ghosts": [], "walls": []}, 0),
+        fresh_state, repeat)
+    results["generate_list"] = time_calls(ActionList.generate_list, hero_state, repeat)
+    results["walking_distances"] = time_calls(
+        lambda simulation: simulation.walls.walking_distances(simulation.heroes_array[0].x, simulation.heroes_array[0].y),
+        state, repeat)
+
+    results["point_to_point"] = bench_point_to_point(states, repeat)
+    results["relaxation"] = bench_relaxation(states, repeat)
+
+    return results
+
+def write_results(results, path):
+    """Guarda los resultados en JSON junto con los datos del equipo."""
+
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "machine": platform.machine(),
+            "platform": platform.platform(),
+            "date": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "seed": BENCH_SEED
+        },
+        "results": results
+    }
+
+    if path is None:
+        json.dump(report, sys.stdout, indent=2)
+        print("")
+    else:
+        with open(path, "w", encoding="utf-8") as output:
+            json.dump(report, output, indent=2)
+
+def compare(baseline_path, current_path):
+    """Imprime la diferencia de cada métrica contra una corrida guardada."""
+
+    with open(baseline_path, "r", encoding="utf-8") as baseline_file:
+        baseline = json.load(baseline_file)["results"]
+    with open(current_path, "r", encoding="utf-8") as current_file:
+        current = json.load(current_file)["results"]
+
+    print(f"{'benchmark':<30}{'metric':<22}{'baseline':>14}{'current':>14}{'delta':>10}")
+    for name in current:
+        if name not in baseline:
+            continue
+
+        for (metric, value) in current[name].items():
+            old = baseline[name].get(metric)
+            if old is None or metric in ["games", "calls"]:
+                continue
+
+            delta = (value - old) / old * 100 if old else 0
+            print(f"{name:<30}{metric:<22}{old:>14.2f}{value:>14.2f}{delta:>+9.1f}%")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmarks de rendimiento de la simulación")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="corre los benchmarks")
+    run_parser.add_argument("--output", help="archivo JSON donde guardar los resultados")
+    run_parser.add_argument("--quick", action="store_true", help="usa un corpus más chico")
+
+    compare_parser = commands.add_parser("compare", help="compara contra una corrida guardada")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current")
+
+    args = parser.parse_args()
+
+    if args.command == "run":
+        write_results(run_benchmarks(args.quick), args.output)
+    else:
+        compare(args.baseline, args.current)
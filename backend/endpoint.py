@@ -1,4 +1,5 @@
 from imports import *
+from profiling import summarize_timings
 
 from typing import TYPE_CHECKING
 if TYPE_CHECKING:
@@ -15,10 +16,13 @@ turns = []
 @app.route("/start/<mode>")
 def start(mode):
     global simulation
+    # Con ?profile=1 se miden los tiempos de cada fase y se cuentan las
+    # búsquedas, ver /timings, /search y el campo "search" de cada /turn
+    profile = request.args.get("profile", "0") == "1"
     if mode == "naive":
-        simulation = Map(True)
+        simulation = Map(True, profile=profile)
     else:
-        simulation = Map(False)
+        simulation = Map(False, profile=profile)
     return "Simulation created"
 
 @app.route("/turn")
@@ -35,5 +39,30 @@ def selected_turn(id):
         return "Simulation not started", 400
     return turns[int(id)]
 
+@app.route("/play/<mode>")
+def play(mode):
+    # Juega una partida completa y solo regresa su resultado. Con ?seed= se
+    # puede repetir la misma partida
+    max_turns = request.args.get("max_turns", None, type=int)
+    seed = request.args.get("seed", None, type=int)
+    result = Map(mode == "naive", seed, payloads=False).run_to_completion(max_turns)
+    return jsonify(result._asdict())
+
+@app.route("/timings")
+def timings():
+    if not isinstance(simulation, Map):
+        return "Simulation not started", 400
+    if not simulation.timers.enabled:
+        return "Simulation started without profile", 400
+    return jsonify(summarize_timings(simulation.timers.to_dict()))
+
+@app.route("/search")
+def search_stats():
+    if not isinstance(simulation, Map):
+        return "Simulation not started", 400
+    if not simulation.search_stats.enabled:
+        return "Simulation started without profile", 400
+    return jsonify(simulation.search_stats.to_dict())
+
 if __name__ == "__main__":
     app.run(debug=True)
\ No newline at end of file
@@ -21,10 +21,16 @@ class Ghosts:
     Attributes:
         dashboard (list[list[int]]): Matriz que representa la niebla y
             los fantasmas en cada casilla del tablero.
+        version (int): Contador de cambios, lo aumenta set_on.
     """
 
-    def __init__(self, walls):
-        """Inicializa las variables de la clase y el tablero."""
+    def __init__(self, walls, rng=None):
+        """Inicializa las variables de la clase y el tablero.
+
+        Args:
+            walls (Walls): Las paredes del tablero.
+            rng (np.random.Generator): El generador para colocar la niebla.
+        """
 
         self.walls = walls  # Referencia a la clase Walls para comprobar vecinos
 
@@ -44,21 +50,31 @@ class Ghosts:
         self.ghost_list = [(2, 2), (2, 3), (3, 2), (3, 3), (4, 3), (4, 4), (5, 3), (6, 5), (6, 6), (7, 5)]
         self.added_damage = 0
 
-        self.rng = np.random.default_rng()  # inicializas un RNG propio
+        self.version = 0 # Aumenta con cada cambio, para saber si un camino sigue siendo válido
+
+        if rng is None:
+            rng = np.random.default_rng()
+        self.rng = rng  # RNG propio de la niebla
 
     def add_poi(self, poi : "POI"):
         """Le añade el POI al fantasma para poder enlazarse."""
         self.poi = poi
 
     # Métodos de generación de coordenadas aleatorias
-    def generate_coords(self):
+    def generate_coords(self, rng=None):
         """Genera coordenadas aleatorias dentro de los límites válidos del tablero.
 
+        Args:
+            rng (np.random.Generator): El generador a usar, por defecto el de la niebla.
+
         Returns:
             tuple[int, int]: Coordenadas (x, y) aleatorias.
         """
-        x = np.random.randint(1, 9)
-        y = np.random.randint(1, 7)
+        if rng is None:
+            rng = self.rng
+
+        x = int(rng.integers(1, 9))
+        y = int(rng.integers(1, 7))
         return (x, y)
 
     # Getters de celdas adyacentes
@@ -96,6 +112,9 @@ class Ghosts:
 
         current = self.dashboard[y][x]
 
+        if current != value:
+            self.version += 1
+
         if current == 1 and value != 1 and (x, y) in self.fog_list:
             self.fog_list.remove((x, y))
         
@@ -117,14 +136,10 @@ class Ghosts:
         Returns:
             list[tuple[int, int]]: Lista de coordenadas vecinas con fantasmas.
         """
-        neighbors = self.walls.get_neighbors(x, y)  # Vecinos accesibles según Walls
-        ghosty_neighbors = []
-
-        for current_x, current_y in neighbors:
-            if self.dashboard[current_y][current_x] == 2:  # hay fantasma
-                ghosty_neighbors.append((current_x, current_y))
+        dashboard = self.dashboard
 
-        return ghosty_neighbors
+        # Vecinos accesibles según Walls que tienen fantasma
+        return [(current_x, current_y) for (current_x, current_y) in self.walls.open_neighbors[y][x] if dashboard[current_y][current_x] == 2]
     
     # Vecinos con niebla
     def get_foggy_neighbors(self, x, y):
@@ -133,14 +148,10 @@ class Ghosts:
         Returns:
             list[tuple[int, int]]: Lista de coordenadas vecinas con niebla.
         """
-        neighbors = self.walls.get_neighbors(x, y)  # Vecinos accesibles según Walls
-        foggy_neighbors = []
+        dashboard = self.dashboard
 
-        for current_x, current_y in neighbors:
-            if self.dashboard[current_y][current_x] == 1:  # hay niebla
-                foggy_neighbors.append((current_x, current_y))
-
-        return foggy_neighbors
+        # Vecinos accesibles según Walls que tienen niebla
+        return [(current_x, current_y) for (current_x, current_y) in self.walls.open_neighbors[y][x] if dashboard[current_y][current_x] == 1]
 
     # Propagación de niebla/fantasmas
     def spread_ghost(self, x, y):
@@ -184,14 +195,15 @@ class Ghosts:
         # Arriba, derecha, abajo, izquierda
         directions = [(0, -1), (1, 0), (0, 1), (-1, 0)]
 
-        ghost = {
-            "x": x,
-            "y": y,
-            "status": 2,
-            "order": self.order
-        }
+        if self.json is not None:
+            ghost = {
+                "x": x,
+                "y": y,
+                "status": 2,
+                "order": self.order
+            }
 
-        self.json["ghosts"].append(ghost) # Añade la casilla donde ocurrió la explosión
+            self.json["ghosts"].append(ghost) # Añade la casilla donde ocurrió la explosión
 
         for diff_x, diff_y in directions:
             current_x, current_y = (x, y)
@@ -321,18 +333,19 @@ class Ghosts:
                         self.walls.set_down(current_x, current_y, set_value)
 
                 if value > 0 and set_value != -1:
-                    wall = {
-                        "direction": side_value, # direccion a la que apunta
-                        "status": set_value, # a que valor se actualiza
-                        "order": self.order,
-                        "x": current_x,
-                        "y": current_y
-                    }
-
                     if value not in [2, 3, 4]:
                         self.added_damage += 1
 
-                    self.json["walls"].append(wall)
+                    if self.json is not None:
+                        wall = {
+                            "direction": side_value, # direccion a la que apunta
+                            "status": set_value, # a que valor se actualiza
+                            "order": self.order,
+                            "x": current_x,
+                            "y": current_y
+                        }
+
+                        self.json["walls"].append(wall)
 
                 if can_end:
                     break
@@ -358,7 +371,8 @@ class Ghosts:
         """Coloca niebla o fantasma según el estado actual de la casilla.
 
         Args:
-            json (Json): El json que contiene los datos que se pasarán en el endpoint.
+            json (Json): El json que contiene los datos que se pasarán en el endpoint,
+                None para no armar payloads.
             order (int): El número de orden de la acción.
         """
 
@@ -9,7 +9,7 @@ if TYPE_CHECKING:
     from actions import *
     from search import *
 
-class Hero(Agent):
+class Hero:
     """El héroe que hará acciones por el mapa para tratar
     de salvar a las 7 víctimas.
     """
@@ -19,8 +19,8 @@ class Hero(Agent):
 
         Args:
             model (Map): El mapa del tablero.
+            id (int): El ID del héroe, empezando en 1.
         """
-        super().__init__(model)
 
         # Atributos necesarios para ejecutar las acciones
         self.map = model
@@ -40,32 +40,43 @@ class Hero(Agent):
             x (int): La coordenada en X.
             y (int): La coordenada en Y.
         """
-        self.map.heroes.move_agent(self, (x, y))
         self.x = x
         self.y = y
+        self.pos = (x, y)
+        self.map.positions[self.id - 1] = self.pos
 
     def step(self):
-        """Realiza un turno."""
-
-        from actions import ActionList, DoNothing
-        from search import closest_poi, closest_exit, closest_ghost
+        """Realiza un turno, si es que el juego no ha terminado."""
 
         # Verifica si aún puede jugar
         if self.map.game_over():
             return
 
+        return self.play_turn()
+
+    def play_turn(self):
+        """Realiza un turno sin verificar si el juego ya terminó."""
+
+        from actions import ActionList, DoNothing
+        from search import closest_poi, closest_exit, closest_ghost
+
         self.action_points = self.stored_action_points + 4 # Se actualizan sus puntos de acción
 
-        self.json = { # Json que se va a mandar
-            "num_steps": self.map.num_steps,
-            "saved_victims": 0,
-            "scared_victims": 0,
-            "damaged_points": 0,
-            "agents":[],
-            "ghosts":[],
-            "walls":[],
-            "pois":[]
-        }
+        payloads = self.map.payloads
+        self.map.search_stats.start_turn()
+
+        self.json = None # Sin payloads el turno no regresa json
+        if payloads:
+            self.json = { # Json que se va a mandar
+                "num_steps": self.map.num_steps,
+                "saved_victims": 0,
+                "scared_victims": 0,
+                "damaged_points": 0,
+                "agents":[],
+                "ghosts":[],
+                "walls":[],
+                "pois":[]
+            }
 
         self.order = 0 # orden dentro del turno en que se realiza una accion
 
@@ -74,13 +85,19 @@ class Hero(Agent):
         self.next_steps = deque()
         self.movement_type = 0
 
+        timers = self.map.timers
+
         # Realiza acciones hasta quedarse sin puntos
         while self.action_points > 0:
             # Verifica si se hace un movimiento naive, o con strat
             if self.map.naiveSimulation: # Simulación naive
+                start = timers.clock()
                 possible_actions = ActionList.generate_list(self)
 
-                np.random.shuffle(possible_actions)
+                self.map.action_rng.shuffle(possible_actions)
+                timers.add("planning", start)
+
+                start = timers.clock()
 
                 # Realiza una acción aleatoria
                 for action in possible_actions:
@@ -91,6 +108,7 @@ class Hero(Agent):
 
             # Movimiento con estrategia
             else:
+                start = timers.clock()
                 if self.has_victim:
                     if not self.next_steps: # Si está vacía
                         self.next_steps = closest_exit(self.map, self.x, self.y)
@@ -99,7 +117,7 @@ class Hero(Agent):
                     if self.movement_type == 0:
                         self.next_steps = closest_poi(self.map, self.id)
                         self.movement_type = 1
-                        if not self.next_steps or len(self.map.ghosts.ghost_list) / 80 > 0.2: # En caso de que está vacía lo lleva al fuego mejor o haya mucho fuego
+                        if not self.next_steps or len(self.map.ghosts.ghost_list) / 80 > self.map.strategy.ghost_density: # En caso de que está vacía lo lleva al fuego mejor o haya mucho fuego
                             self.next_steps = closest_ghost(self.map, self.x, self.y)
                             self.movement_type = 2
                     
@@ -119,7 +137,9 @@ class Hero(Agent):
                         self.next_steps = closest_ghost(self.map, self.x, self.y)
                         self.movement_type = 2   
                         """
+                timers.add("planning", start)
 
+                start = timers.clock()
                 if not self.next_steps:
                     action = DoNothing(0, self, 4)
                     action.is_possible()
@@ -132,17 +152,18 @@ class Hero(Agent):
             if self.map.poi.get(self.x, self.y) == 3:
                 new_poi_value = self.map.poi.pick(self.x, self.y)
 
-                poi = {
-                    "x": self.x,
-                    "y": self.y,
-                    "old_status": 3,
-                    "new_status": int(new_poi_value), # poi eliminado
-                    "order": self.order
-                }
+                if payloads:
+                    poi = {
+                        "x": self.x,
+                        "y": self.y,
+                        "old_status": 3,
+                        "new_status": int(new_poi_value), # poi eliminado
+                        "order": self.order
+                    }
 
-                self.order += 1
+                    self.json["pois"].append(poi)
 
-                self.json["pois"].append(poi)
+                self.order += 1
 
                 if new_poi_value == 4: # Si es una víctima real
                     if not self.has_victim: # En caso de que no lleve a nadie
@@ -154,57 +175,79 @@ class Hero(Agent):
             elif self.map.poi.get(self.x, self.y) == 4 and not self.has_victim: # Que alguien más lo reveló pero no lo agarró
                 self.hold_poi_on(self.x, self.y)
 
+            timers.add("actions", start)
+
             self.order += 1
         
-        self.old_matrix = copy.deepcopy(self.map.ghosts.dashboard)
+        # La copia solo sirve para encontrar los cambios que van en el json
+        if payloads:
+            start = timers.clock()
+            self.old_matrix = copy.deepcopy(self.map.ghosts.dashboard)
+            timers.add("deepcopy", start)
+
         self.map.poi.added_pois = []
         self.map.poi.removed_pois = []
 
         # Después de los movimientos del héroe, finalizo el turno
+        start = timers.clock()
         self.map.damage_points += self.map.ghosts.place_fog(self.json, self.order) # Coloca la niebla
-        self.check_ghost_changes() # verifica cambios y agrega en json
+        timers.add("place_fog", start)
+
+        if payloads:
+            start = timers.clock()
+            self.check_ghost_changes() # verifica cambios y agrega en json
+            timers.add("ghost_diff", start)
 
         self.order += 1 # cambio de sub-turbo entre colocar fantasmas y pois
 
-        for p in self.map.poi.removed_pois:
-            poi = {
-                "x": p[0][0],
-                "y": p[0][1],
-                "old_status": int(p[1]),
-                "new_status": 0, # poi eliminado
-                "order": self.order
-            }
+        if payloads:
+            start = timers.clock()
+            for p in self.map.poi.removed_pois:
+                poi = {
+                    "x": p[0][0],
+                    "y": p[0][1],
+                    "old_status": int(p[1]),
+                    "new_status": 0, # poi eliminado
+                    "order": self.order
+                }
 
-            self.json["pois"].append(poi)
+                self.json["pois"].append(poi)
+            timers.add("json", start)
         
         self.order += 1 # entre pois removidos y pois agregados
 
+        start = timers.clock()
         while self.map.poi.current < 3: # Coloca POIs si es que hay menos de 3
-            self.map.poi.place(self.map.heroes)
-
-        for p in self.map.poi.added_pois:
-            poi = {
-                "x": p[0][0],
-                "y": p[0][1],
-                "old_status": 3, # poi agregado
-                "new_status": 3, # poi agregado
-                "order": self.order
-            }
+            self.map.poi.place(self.map)
+        timers.add("poi_refill", start)
 
-            if p[1] > 0: # Antes había algo y se eliminó
-                ghost = {
+        if payloads:
+            start = timers.clock()
+            for p in self.map.poi.added_pois:
+                poi = {
                     "x": p[0][0],
                     "y": p[0][1],
-                    "status": 0, # no hay nada
+                    "old_status": 3, # poi agregado
+                    "new_status": 3, # poi agregado
                     "order": self.order
                 }
 
-                self.json["ghosts"].append(ghost)
-        
-            self.json["pois"].append(poi)
+                if p[1] > 0: # Antes había algo y se eliminó
+                    ghost = {
+                        "x": p[0][0],
+                        "y": p[0][1],
+                        "status": 0, # no hay nada
+                        "order": self.order
+                    }
+
+                    self.json["ghosts"].append(ghost)
+            
+                self.json["pois"].append(poi)
+            timers.add("json", start)
 
         self.order += 1
 
+        start = timers.clock()
         for hero in self.map.heroes_array:
             # TODO: No mata al heroe si es expandido por el fuego
             # TODO: En el json agregar el poi en el MISMO turno
@@ -220,6 +263,10 @@ class Hero(Agent):
 
                 hero.to_closest_spawn_point() # Lo lleva al spawnpoint
                 hero.stored_action_points = 0 # Se eliminan puntos de acción guardados
+
+                if not payloads:
+                    continue
+
                 agent = {
                     "x": hero.x,
                     "y": hero.y,
@@ -231,26 +278,49 @@ class Hero(Agent):
                 }
 
                 self.json["agents"].append(agent)
+        timers.add("knock_back", start)
+
+        if payloads:
+            self.json["saved_victims"] = self.map.poi.rescued_victims
+            self.json["scared_victims"] = self.map.poi.scared_victims
+            self.json["damaged_points"] = self.map.damage_points
 
-        self.json["saved_victims"] = self.map.poi.rescued_victims
-        self.json["scared_victims"] = self.map.poi.scared_victims
-        self.json["damaged_points"] = self.map.damage_points
+            # Solo si se cuentan las búsquedas (con profile)
+            if self.map.search_stats.enabled:
+                self.json["search"] = self.map.search_stats.turn_dict()
 
         return self.json
 
     def to_closest_spawn_point(self):
-        """Mueve el héroe al spawn point más cercano."""
+        """Mueve el héroe al spawn point más cercano. Con spawn_distance
+        "walking" en la Strategy se mide caminando y, si no puede llegar a
+        ninguno, en distancia manhattan; con "manhattan", siempre así.
+        """
 
-        closest_spawn_point = (0, 0, 1000)
+        closest_spawn_point = (0, 0, np.inf)
 
-        # Busca la distancia más corta entre los spawnpoints
-        for spawn_point in self.map.spawn_points:
-            distance = abs(spawn_point[0] - self.x) + abs(spawn_point[1] - self.y) # Obtiene la distancia manhattan
+        if self.map.strategy.spawn_distance == "walking":
+            distances = self.map.walls.walking_distances(self.x, self.y)
+            height = len(self.map.ghosts.dashboard)
 
-            if distance < closest_spawn_point[2]: # Verifica que sea más cercano
-                closest_spawn_point = (spawn_point[0], spawn_point[1], distance)
+            # Busca la distancia más corta entre los spawnpoints
+            for spawn_point in self.map.spawn_points:
+                distance = distances[spawn_point[0] * height + spawn_point[1]]
+
+                if distance < closest_spawn_point[2]: # Verifica que sea más cercano
+                    closest_spawn_point = (spawn_point[0], spawn_point[1], distance)
+
+        if closest_spawn_point[2] == np.inf: # Casilla encerrada o distancia manhattan
+            closest_spawn_point = (0, 0, 1000)
+
+            for spawn_point in self.map.spawn_points:
+                distance = abs(spawn_point[0] - self.x) + abs(spawn_point[1] - self.y) # Obtiene la distancia manhattan
+
+                if distance < closest_spawn_point[2]: # Verifica que sea más cercano
+                    closest_spawn_point = (spawn_point[0], spawn_point[1], distance)
 
         self.update_position(closest_spawn_point[0], closest_spawn_point[1])
+        self.map.planning.knocked_back() # Su POI asignado ya no es el más conveniente
     
     def check_ghost_changes(self):
         """
@@ -271,6 +341,9 @@ class Hero(Agent):
         self.has_victim = True
         self.map.poi.willBeRescued(x, y) # Quito en el mapa la víctima
 
+        if not self.map.payloads:
+            return
+
         poi = {
             "x": x,
             "y": y,
@@ -1,14 +1,15 @@
 import numpy as np
-from mesa.space import MultiGrid
-from mesa import Model
-from mesa.time import BaseScheduler
 from collections import deque
-from mesa import Agent
 from abc import ABC, abstractmethod
-from flask import Flask, jsonify
+from flask import Flask, jsonify, request
 import copy
 import heapq
 
+from strategy import Strategy
+from profiling import PhaseTimers
+from search_stats import SearchStats
+from path_cache import PathCache
+from planning import PlanningContext
 from walls import Walls
 from ghosts import Ghosts
 from poi import POI
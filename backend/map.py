@@ -1,5 +1,7 @@
 from imports import *
 
+from collections import namedtuple
+
 from typing import TYPE_CHECKING
 if TYPE_CHECKING:
     from walls import *
@@ -8,32 +10,70 @@ if TYPE_CHECKING:
     from hero import *
     from actions import *
 
-class Map(Model):
-    """El mapa donde se correrá la simulación."""
-    def __init__(self, naiveSimulation):
+# Razones por las que terminó una partida
+LOSS_NONE = 0 # La partida se ganó
+LOSS_SCARED = 1 # Se asustaron 4 víctimas
+LOSS_DAMAGE = 2 # La casa llegó a 24 puntos de daño
+LOSS_MAX_TURNS = 3 # Se alcanzó el límite de turnos sin terminar
+
+# Resultado de una partida completa, ver Map.run_to_completion
+GameResult = namedtuple("GameResult", ["win", "rescued", "scared", "damage", "steps", "loss_reason"])
+
+class Map:
+    """El mapa donde se correrá la simulación.
+
+    Es el núcleo sin Mesa: las posiciones de los héroes se guardan en una
+    lista simple y los turnos se llevan sin scheduler. Para visualizar con
+    Mesa se usa MesaMap de mesa_map.py, que envuelve a este mapa.
+    """
+    def __init__(self, naiveSimulation, seed=None, strategy=None, profile=False, payloads=True):
         """Constructor del modelo.
 
         Args:
             naiveSimulation (bool): Bandera que dicta si el modelo es naive o con strat.
+            seed (int): La semilla de la partida, None para usar una aleatoria.
+            strategy (Strategy): Los parámetros de la strat, por defecto Strategy().
+            profile (bool): Si se miden los tiempos de cada fase de los turnos
+                y se cuentan las búsquedas (ver SearchStats).
+            payloads (bool): Si cada turno arma su json de eventos. Sin payloads
+                se juega exactamente igual, pero turn() regresa None.
         """
 
-        super().__init__()
-
-        self.schedule = BaseScheduler(self)
+        # Un solo generador por partida, dividido en flujos independientes
+        # para la niebla, los POIs y las acciones naive
+        self.seed = seed
+        (fog_seed, poi_seed, action_seed) = np.random.SeedSequence(seed).spawn(3)
+        self.action_rng = np.random.default_rng(action_seed)
 
         # La creación de las diferentes matrices
         self.walls = Walls()
-        self.ghosts = Ghosts(self.walls)
-        self.poi = POI(self.ghosts)
+        self.ghosts = Ghosts(self.walls, np.random.default_rng(fog_seed))
+        self.poi = POI(self.ghosts, np.random.default_rng(poi_seed))
         self.ghosts.add_poi(self.poi)
-        self.heroes = MultiGrid(10, 8, torus = False)
         self.num_steps = 0
 
         self.damage_points = 0 # El daño actual del mapa
         self.naiveSimulation = naiveSimulation
+        self.payloads = payloads
+
+        if strategy is None:
+            strategy = Strategy()
+        self.strategy = strategy
 
         self.win = False
 
+        # Tiempos por fase de todos los turnos de la partida
+        self.timers = PhaseTimers(profile)
+
+        # Trabajo de las búsquedas por caller, del turno y de la partida
+        self.search_stats = SearchStats(profile)
+
+        # Resultados de dijkstra mientras el tablero no cambie
+        self.path_cache = PathCache()
+
+        # Los campos de distancia de la ronda, compartidos por los héroes
+        self.planning = PlanningContext(self)
+
         # Las posiciones iniciales de los héroes
         self.initial_positions = [
             (6, 0),
@@ -55,15 +95,14 @@ class Map(Model):
             (0, 4),
         ]
 
-        # Se añaden los héroes al tablero
+        # Se añaden los héroes al tablero, positions[i] es la casilla del héroe i + 1
+        self.positions = list(self.initial_positions)
         self.heroes_array = []
         counter = 1
         for position in self.initial_positions:
             hero = Hero(self, counter)
-            (hero.x, hero.y) = position
-            self.heroes.place_agent(hero, position)
+            hero.update_position(position[0], position[1])
             self.heroes_array.append(hero)
-            self.schedule.add(hero)
             counter += 1
 
         self.current_hero = 0
@@ -72,16 +111,67 @@ class Map(Model):
     def step(self):
         """Realiza una ronda completa de turnos."""
 
-        self.schedule.step() # Ejecuta un turno en cada agente
+        self.planning.start_round()
+        for hero in self.heroes_array: # Ejecuta un turno en cada héroe
+            hero.step()
 
     def turn(self):
         """Realiza únicamente el turno del próximo héroe."""
 
+        if self.current_hero == 0:
+            self.planning.start_round()
+
         json = self.heroes_array[self.current_hero].step()
         self.current_hero = (self.current_hero + 1) % 6
         self.num_steps += 1
         return json
 
+    def run_to_completion(self, max_turns=None):
+        """Juega la partida hasta que termine, sin armar nada por turno.
+
+        Args:
+            max_turns (int): El límite de turnos, None para no tener límite.
+
+        Returns:
+            GameResult: El resultado de la partida. Si se alcanzó el límite,
+                loss_reason es LOSS_MAX_TURNS.
+        """
+
+        heroes = self.heroes_array
+
+        while not self.game_over():
+            if max_turns is not None and self.num_steps >= max_turns:
+                loss_reason = LOSS_MAX_TURNS
+                break
+
+            if self.current_hero == 0:
+                self.planning.start_round()
+
+            # game_over ya se verificó, así que el héroe no lo repite
+            heroes[self.current_hero].play_turn()
+            self.current_hero = (self.current_hero + 1) % 6
+            self.num_steps += 1
+        else:
+            loss_reason = self.loss_reason()
+
+        return GameResult(
+            self.win,
+            self.poi.rescued_victims,
+            self.poi.scared_victims,
+            self.damage_points,
+            self.num_steps,
+            loss_reason
+        )
+
+    def is_cell_empty(self, position):
+        """Verifica que ningún héroe esté en la casilla.
+
+        Args:
+            position (tuple[int, int]): La casilla a verificar.
+        """
+
+        return position not in self.positions
+
     def game_over(self):
         """Verifica si con el estado actual del tablero, el
         juego ya acabó o aún no.
@@ -96,4 +186,20 @@ class Map(Model):
             self.win = False
             return True
         
-        return False
\ No newline at end of file
+        return False
+
+    def loss_reason(self):
+        """Regresa la razón por la que se perdió la partida, o LOSS_NONE
+        si se ganó o aún no termina.
+        """
+
+        if self.win:
+            return LOSS_NONE
+
+        if self.damage_points >= 24:
+            return LOSS_DAMAGE
+
+        if self.poi.scared_victims >= 4:
+            return LOSS_SCARED
+
+        return LOSS_NONE
@@ -0,0 +1,78 @@
+from imports import *
+from mesa.space import MultiGrid
+from mesa import Model
+from mesa.time import BaseScheduler
+from mesa import Agent
+
+from typing import TYPE_CHECKING
+if TYPE_CHECKING:
+    from map import *
+    from hero import *
+
+class HeroAgent(Agent):
+    """Representa a un héroe dentro de Mesa, únicamente para visualizarlo."""
+
+    def __init__(self, model : "MesaMap", hero : "Hero"):
+        """Constructor del agente.
+
+        Args:
+            model (MesaMap): El modelo de Mesa.
+            hero (Hero): El héroe del mapa que representa.
+        """
+        super().__init__(model)
+
+        self.hero = hero
+
+    def step(self):
+        """Realiza el turno del héroe y actualiza las posiciones en la grid."""
+
+        json = self.hero.step()
+        self.model.sync()
+        return json
+
+class MesaMap(Model):
+    """Adaptador de Map para Mesa.
+
+    Las reglas se ejecutan en Map, sin Mesa, y esta clase solo mantiene una
+    MultiGrid y un scheduler sincronizados con las posiciones de los héroes.
+    """
+
+    def __init__(self, naiveSimulation, seed=None, strategy=None):
+        """Constructor del modelo, recibe los mismos parámetros que Map."""
+
+        super().__init__()
+
+        self.map = Map(naiveSimulation, seed, strategy)
+        self.schedule = BaseScheduler(self)
+        self.heroes = MultiGrid(10, 8, torus = False)
+
+        self.hero_agents = []
+        for hero in self.map.heroes_array:
+            agent = HeroAgent(self, hero)
+            self.heroes.place_agent(agent, hero.pos)
+            self.schedule.add(agent)
+            self.hero_agents.append(agent)
+
+    def sync(self):
+        """Mueve en la grid a los héroes que cambiaron de casilla."""
+
+        for agent in self.hero_agents:
+            if agent.pos != agent.hero.pos:
+                self.heroes.move_agent(agent, agent.hero.pos)
+
+    def step(self):
+        """Realiza una ronda completa de turnos."""
+
+        self.schedule.step() # Ejecuta un turno en cada agente
+
+    def turn(self):
+        """Realiza únicamente el turno del próximo héroe."""
+
+        json = self.map.turn()
+        self.sync()
+        return json
+
+    def game_over(self):
+        """Verifica si el juego ya acabó."""
+
+        return self.map.game_over()
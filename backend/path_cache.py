@@ -0,0 +1,57 @@
+from collections import OrderedDict
+
+class PathCache:
+    """Caché LRU de los resultados de dijkstra.
+
+    Las llaves incluyen las versiones de Walls y Ghosts, así que un
+    resultado solo se reutiliza mientras el tablero no haya cambiado y las
+    entradas viejas simplemente dejan de pedirse hasta que se desalojan.
+    """
+
+    def __init__(self, capacity=64):
+        """Constructor de la caché.
+
+        Args:
+            capacity (int): Los resultados que se guardan como máximo.
+        """
+
+        self.capacity = capacity
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        """Regresa el resultado guardado con la llave, o None si no está."""
+
+        value = self.entries.get(key)
+
+        if value is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self.entries.move_to_end(key)
+        return value
+
+    def put(self, key, value):
+        """Guarda un resultado, desalojando el menos usado si está llena."""
+
+        self.entries[key] = value
+        self.entries.move_to_end(key)
+
+        if len(self.entries) > self.capacity:
+            self.entries.popitem(last=False)
+
+    def hit_rate(self):
+        """Regresa el porcentaje de consultas que se encontraron en la caché."""
+
+        total = self.hits + self.misses
+        if total == 0:
+            return 0
+
+        return self.hits / total * 100
+
+    def clear(self):
+        """Vacía la caché sin reiniciar los contadores."""
+
+        self.entries.clear()
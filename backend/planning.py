@@ -0,0 +1,118 @@
+from typing import TYPE_CHECKING
+if TYPE_CHECKING:
+    from map import *
+
+class PlanningContext:
+    """Lo que comparten los turnos de los seis héroes: los campos que no
+    dependen del héroe y la asignación de POIs.
+
+    Cada campo se guarda con una llave (por ejemplo ("poi", coords)).
+    Mientras las versiones de Walls y Ghosts no cambien, cualquier héroe lo
+    reutiliza; en cuanto cambian, se descartan todos. Las búsquedas desde
+    la casilla de un héroe no van aquí sino en la PathCache del mapa.
+
+    Lleva la cuenta de las búsquedas que se corren (dijkstra y
+    multi_source_dijkstra, sin contar las reutilizadas), por ronda y en
+    total.
+    """
+
+    def __init__(self, map: "Map"):
+        """Constructor del contexto.
+
+        Args:
+            map (Map): El mapa del tablero.
+        """
+
+        self.map = map
+        self.board = None # Las versiones de Walls y Ghosts de los campos guardados
+        self.fields = {}
+
+        self.assignment = {} # La asignación óptima de POIs, ver poi_assignment
+        self.assignment_key = None
+
+        self.rounds = 0
+        self.searches = 0 # Búsquedas de la ronda actual
+        self.total_searches = 0
+
+    def start_round(self):
+        """Empieza una ronda nueva, con sus contadores en cero."""
+
+        self.rounds += 1
+        self.searches = 0
+
+    def searched(self):
+        """Cuenta una búsqueda que se tuvo que correr."""
+
+        self.searches += 1
+        self.total_searches += 1
+
+    def field(self, key, build):
+        """Regresa el campo con la llave, creándolo con build si no está
+        o si el tablero cambió desde que se guardó.
+
+        Args:
+            key (tuple): La llave del campo, debe incluir todo lo que no
+                sea el tablero y de lo que dependa el campo. No debe
+                depender del héroe que lo pide.
+            build (callable): Crea el campo, sin argumentos.
+        """
+
+        board = (self.map.walls.version, self.map.ghosts.version)
+        if board != self.board:
+            self.fields.clear()
+            self.board = board
+
+        value = self.fields.get(key)
+        if value is None:
+            value = build()
+            self.fields[key] = value
+
+        return value
+
+    def poi_assignment(self, field):
+        """Regresa la asignación óptima de POIs a héroes, resolviéndola solo
+        cuando aparece o desaparece un POI, un héroe toma o deja una víctima o
+        un héroe es derribado (ver knocked_back).
+
+        Args:
+            field (PoiField): El campo de los POIs actuales.
+
+        Returns:
+            dict[int, int]: El índice del POI de cada héroe con uno asignado.
+        """
+
+        from assignment import optimal_assignment
+
+        key = (tuple(field.coords), tuple(hero.has_victim for hero in self.map.heroes_array))
+        if key != self.assignment_key:
+            self.assignment = optimal_assignment(field)
+            self.assignment_key = key
+
+        return self.assignment
+
+    def knocked_back(self):
+        """Descarta la asignación de POIs para que se vuelva a resolver.
+        Se llama cuando un héroe regresa a un spawn point, porque su
+        distancia a cada POI cambió aunque la llave no.
+        """
+
+        self.assignment_key = None
+
+    def clear(self):
+        """Descarta los campos guardados y la asignación de POIs sin
+        reiniciar los contadores.
+        """
+
+        self.fields.clear()
+        self.board = None
+        self.assignment = {}
+        self.assignment_key = None
+
+    def to_dict(self):
+        """Regresa los contadores de toda la partida."""
+
+        return {
+            "rounds": self.rounds,
+            "searches": self.total_searches,
+            "searches_per_round": self.total_searches / self.rounds if self.rounds else 0
+        }
@@ -22,11 +22,20 @@ class POI:
             5 -> Falsa alarma
     """
 
-    def __init__(self, ghosts : "Ghosts"):
-        """Inicializa las variables de la clase y el tablero de POI."""
+    def __init__(self, ghosts : "Ghosts", rng=None):
+        """Inicializa las variables de la clase y el tablero de POI.
+
+        Args:
+            ghosts (Ghosts): Los fantasmas del tablero.
+            rng (np.random.Generator): El generador para revelar y colocar POIs.
+        """
 
         self.ghosts = ghosts  # Referencia al objeto ghosts para generar coordenadas
 
+        if rng is None:
+            rng = np.random.default_rng()
+        self.rng = rng
+
         # Matriz del tablero con las ubicaciones POI iniciales
         self.dashboard = [
             [0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
@@ -63,7 +72,7 @@ class POI:
             return -1  # No hay POI disponibles
 
         # Mezcla el vector y selecciona el primer POI
-        np.random.shuffle(self.poi_list)
+        self.rng.shuffle(self.poi_list)
         poi_value = self.poi_list[0]
 
         # Elimina el POI seleccionado del vector
@@ -82,14 +91,18 @@ class POI:
 
         return self.dashboard[y][x]
 
-    def place(self, heroes: MultiGrid):
-        """Coloca un POI sin saber qué es en el tablero."""
+    def place(self, heroes: "Map"):
+        """Coloca un POI sin saber qué es en el tablero.
+
+        Args:
+            heroes (Map): El mapa, para verificar dónde están los héroes.
+        """
 
-        x, y = self.ghosts.generate_coords()  # Genera coordenadas aleatorias
+        x, y = self.ghosts.generate_coords(self.rng)  # Genera coordenadas aleatorias
 
         # Busca una casilla libre en el tablero
         while self.dashboard[y][x] != 0 and not heroes.is_cell_empty((x, y)):
-            x, y = self.ghosts.generate_coords()
+            x, y = self.ghosts.generate_coords(self.rng)
 
         self.dashboard[y][x] = 3  # Coloca el POI en la casilla libre
 
@@ -0,0 +1,113 @@
+import time
+
+# Las fases de un turno de Hero.step, en el orden en que ocurren
+PHASES = [
+    "planning", # closest_poi, closest_ghost, closest_exit o la lista de acciones naive
+    "actions", # Ejecutar las acciones y revelar POIs
+    "deepcopy", # La copia del tablero de fantasmas
+    "place_fog", # Ghosts.place_fog
+    "ghost_diff", # check_ghost_changes
+    "poi_refill", # Colocar POIs hasta tener 3
+    "knock_back", # Regresar a los héroes alcanzados por fantasmas
+    "json" # Armar los diccionarios de pois del json
+]
+
+class PhaseTimers:
+    """Tiempos acumulados y cantidad de llamadas de cada fase de un turno.
+
+    Se usa como:
+        start = timers.clock()
+        ...
+        timers.add("fase", start)
+
+    Apagado, clock() regresa 0 y add() no hace nada, así que solo cuesta
+    la llamada.
+    """
+
+    def __init__(self, enabled=False):
+        """Constructor de los timers.
+
+        Args:
+            enabled (bool): Si se miden los tiempos o no.
+        """
+
+        self.enabled = enabled
+        self.totals = dict.fromkeys(PHASES, 0) # Nanosegundos por fase
+        self.calls = dict.fromkeys(PHASES, 0)
+
+    def clock(self):
+        """Regresa el tiempo actual en nanosegundos, o 0 si está apagado."""
+
+        if not self.enabled:
+            return 0
+
+        return time.perf_counter_ns()
+
+    def add(self, phase, start):
+        """Suma a la fase el tiempo desde start.
+
+        Args:
+            phase (str): El nombre de la fase.
+            start (int): Lo que regresó clock() al empezar la fase.
+        """
+
+        if not self.enabled:
+            return
+
+        self.totals[phase] = self.totals.get(phase, 0) + time.perf_counter_ns() - start
+        self.calls[phase] = self.calls.get(phase, 0) + 1
+
+    def to_dict(self):
+        """Regresa los acumulados como {fase: [nanosegundos, llamadas]}."""
+
+        return {phase: [self.totals[phase], self.calls[phase]] for phase in self.totals}
+
+def merge_timings(total, timings):
+    """Suma unos tiempos en formato to_dict a otros, por ejemplo los de
+    cada partida a los de su corrida.
+
+    Args:
+        total (dict): Los tiempos acumulados, se modifica.
+        timings (dict): Los tiempos a sumar.
+
+    Returns:
+        dict: El acumulado.
+    """
+
+    for (phase, (nanoseconds, calls)) in timings.items():
+        (old_nanoseconds, old_calls) = total.get(phase, (0, 0))
+        total[phase] = [old_nanoseconds + nanoseconds, old_calls + calls]
+
+    return total
+
+def summarize_timings(timings):
+    """Calcula el total, el promedio por llamada y el porcentaje de cada fase.
+
+    Args:
+        timings (dict): Los tiempos en formato to_dict.
+
+    Returns:
+        dict: Por fase, total_ms, calls, mean_us y share.
+    """
+
+    overall = sum(nanoseconds for (nanoseconds, calls) in timings.values())
+    summary = {}
+
+    for (phase, (nanoseconds, calls)) in timings.items():
+        summary[phase] = {
+            "total_ms": nanoseconds / 1e6,
+            "calls": calls,
+            "mean_us": nanoseconds / calls / 1000 if calls else 0,
+            "share": nanoseconds / overall * 100 if overall else 0
+        }
+
+    return summary
+
+def format_timings(timings):
+    """Regresa los tiempos de cada fase como una tabla de texto."""
+
+    lines = [f"{'phase':<12}{'total ms':>12}{'calls':>10}{'mean us':>10}{'share':>8}"]
+    for (phase, values) in summarize_timings(timings).items():
+        lines.append(f"{phase:<12}{values['total_ms']:>12.1f}{values['calls']:>10}{values['mean_us']:>10.1f}{values['share']:>7.1f}%")
+
+    return "\n".join(lines)
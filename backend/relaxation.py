@@ -0,0 +1,112 @@
+from imports import *
+
+from typing import TYPE_CHECKING
+if TYPE_CHECKING:
+    from map import *
+
+# Las direcciones con los bits de Walls.open_mask: arriba, derecha, abajo, izquierda
+DX = np.array([0, 1, 0, -1])
+DY = np.array([-1, 0, 1, 0])
+OPPOSITE = [2, 3, 0, 1]
+
+# El orden en que neigbors_with_cost recorre los vecinos: izquierda, derecha, arriba, abajo
+NEIGHBOR_ORDER = [3, 1, 0, 2]
+
+def shift(grid, direction):
+    """Regresa el arreglo con el valor del vecino en la dirección dada en
+    cada casilla (las dos últimas dimensiones son y, x).
+
+    En los bordes da la vuelta, pero ahí las paredes nunca dejan pasar.
+    """
+
+    return np.roll(grid, (-DY[direction], -DX[direction]), axis=(-2, -1))
+
+def edge_costs(map: "Map", movement_type):
+    """Calcula el costo de salir de cada casilla hacia cada dirección, igual
+    que neigbors_with_cost pero para todo el tablero a la vez.
+
+    El multiplicador se divide entre ghost_divisor por cada vecino con
+    fantasma en el mismo orden que neigbors_with_cost, y con divisiones
+    sucesivas, así que los costos salen idénticos.
+
+    Returns:
+        np.ndarray: 4 x alto x ancho, inf donde no se puede pasar.
+    """
+
+    strategy = map.strategy
+    ghosts = np.array(map.ghosts.dashboard, dtype=np.float64)
+    open_mask = np.array(map.walls.open_mask)
+    door_mask = np.array(map.walls.door_mask)
+
+    multiplier = 1
+    if movement_type == 2:
+        multiplier = strategy.ghost_multiplier
+
+    # El multiplicador después de 0, 1, ... 8 vecinos con fantasma
+    multipliers = [multiplier]
+    for _ in range(8):
+        multipliers.append(multipliers[-1] / strategy.ghost_divisor)
+    multipliers = np.array(multipliers, dtype=np.float64)
+
+    costs = np.full((4,) + ghosts.shape, np.inf)
+    divisions = np.zeros(ghosts.shape, dtype=np.int64)
+
+    # Primero los vecinos abiertos y luego los de puerta, como neigbors_with_cost
+    for (mask, door) in [(open_mask, 0), (door_mask, 1)]:
+        for direction in NEIGHBOR_ORDER:
+            passable = (mask >> direction) & 1 == 1
+            neighbor = shift(ghosts, direction)
+
+            divisions += passable & (neighbor == 2)
+            cost = np.where(neighbor == 0, 1 + door, neighbor * multipliers[divisions] + door)
+            costs[direction] = np.where(passable, cost, costs[direction])
+
+    return costs
+
+def distance_fields(map: "Map", sources, movement_type):
+    """Calcula las distancias desde varias casillas relajando todo el tablero
+    con NumPy, en lugar de un dijkstra por casilla.
+
+    En cada pasada cada casilla toma el mínimo entre su costo y el de cada
+    vecino más la arista, hasta que ya nada cambia. Los costos son los de
+    dijkstra, así que el resultado coincide con sus costos (inf en lugar de
+    UNREACHED).
+
+    Args:
+        map (Map): El mapa del tablero
+        sources (list[tuple[int, int]]): Las casillas de origen, por ejemplo
+            todos los héroes, todos los POIs o todas las salidas.
+        movement_type (int): El tipo de movimiento
+
+    Returns:
+        np.ndarray: len(sources) x alto x ancho, el campo de cada origen.
+    """
+
+    costs = edge_costs(map, movement_type)
+    (height, width) = costs.shape[1:]
+
+    # El costo de llegar a cada casilla desde su vecino en cada dirección
+    incoming = [shift(costs[OPPOSITE[direction]], direction) for direction in range(4)]
+
+    # Los campos llevan un borde de inf, así los vecinos son vistas sin copiar
+    padded = np.full((len(sources), height + 2, width + 2), np.inf)
+    fields = padded[:, 1:-1, 1:-1]
+    if not sources:
+        return fields.copy()
+
+    (xs, ys) = zip(*sources)
+    fields[np.arange(len(sources)), list(ys), list(xs)] = 0
+
+    neighbors = [padded[:, 1 + DY[direction]:height + 1 + DY[direction], 1 + DX[direction]:width + 1 + DX[direction]] for direction in range(4)]
+
+    changed = True
+    while changed:
+        changed = False
+        for direction in range(4):
+            candidate = neighbors[direction] + incoming[direction]
+            shorter = candidate < fields
+            if shorter.any():
+                np.copyto(fields, candidate, where=shorter)
+                changed = True
+
+    return fields.copy()
@@ -0,0 +1,199 @@
+from imports import *
+
+import json
+import os
+import sys
+
+from map import LOSS_SCARED, LOSS_DAMAGE, LOSS_MAX_TURNS
+
+from typing import TYPE_CHECKING
+if TYPE_CHECKING:
+    from runner import *
+
+# Columnas de cada registro, cada una se guarda en su propio archivo
+RESULT_COLUMNS = [
+    ("seed", "<u8"),
+    ("mode", "u1"), # 0 -> con strat, 1 -> naive
+    ("win", "u1"),
+    ("rescued", "u1"),
+    ("scared", "u1"),
+    ("damage_points", "u1"),
+    ("num_steps", "<u4"),
+    ("loss_reason", "u1"),
+]
+
+class ResultSink:
+    """Guarda en disco un registro de tamaño fijo por partida.
+
+    Los resultados se guardan por columnas dentro de una carpeta, un
+    archivo binario por columna y un meta.json con la cantidad de
+    registros, así cada columna se puede abrir con np.memmap. En memoria
+    solo se guarda un buffer de tamaño fijo, sin importar cuántas
+    partidas se jueguen.
+    """
+
+    def __init__(self, path, buffer_size=65536):
+        """Abre (o crea) la carpeta de resultados para añadir registros.
+
+        Args:
+            path (str): La carpeta donde se guardan las columnas.
+            buffer_size (int): Los registros que se juntan antes de escribir.
+        """
+
+        self.path = path
+        self.buffer_size = buffer_size
+        self.buffered = 0
+
+        os.makedirs(path, exist_ok=True)
+
+        self.count = read_count(path)
+
+        self.buffers = {}
+        self.files = {}
+        for (name, dtype) in RESULT_COLUMNS:
+            self.buffers[name] = np.empty(buffer_size, dtype=dtype)
+
+            # Si quedó algo escrito después del último meta.json, se descarta
+            column_path = os.path.join(path, name + ".bin")
+            column_file = open(column_path, "ab")
+            column_file.truncate(self.count * np.dtype(dtype).itemsize)
+            self.files[name] = column_file
+
+    def append(self, outcome: "GameOutcome"):
+        """Añade el registro de una partida."""
+
+        i = self.buffered
+        for (name, dtype) in RESULT_COLUMNS:
+            self.buffers[name][i] = getattr(outcome, name)
+
+        self.buffered += 1
+        if self.buffered == self.buffer_size:
+            self.flush()
+
+    def flush(self):
+        """Escribe los registros pendientes y actualiza el meta.json."""
+
+        if self.buffered == 0:
+            return
+
+        for (name, dtype) in RESULT_COLUMNS:
+            self.files[name].write(self.buffers[name][:self.buffered].tobytes())
+            self.files[name].flush()
+
+        self.count += self.buffered
+        self.buffered = 0
+
+        write_count(self.path, self.count)
+
+    def truncate(self, count):
+        """Descarta los registros a partir de count, por ejemplo para
+        reanudar un lote desde su último checkpoint.
+        """
+
+        self.flush()
+        self.count = min(self.count, count)
+
+        for (name, dtype) in RESULT_COLUMNS:
+            self.files[name].truncate(self.count * np.dtype(dtype).itemsize)
+
+        write_count(self.path, self.count)
+
+    def close(self):
+        """Escribe lo pendiente y cierra los archivos."""
+
+        self.flush()
+        write_count(self.path, self.count)
+
+        for column_file in self.files.values():
+            column_file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def read_count(path):
+    """Regresa la cantidad de registros guardados en la carpeta."""
+
+    meta_path = os.path.join(path, "meta.json")
+    if not os.path.exists(meta_path):
+        return 0
+
+    with open(meta_path, "r", encoding="utf-8") as meta_file:
+        return json.load(meta_file)["count"]
+
+def write_count(path, count):
+    """Escribe el meta.json de la carpeta de resultados."""
+
+    meta = {
+        "count": count,
+        "columns": [[name, dtype] for (name, dtype) in RESULT_COLUMNS]
+    }
+
+    # Se escribe aparte y se reemplaza para no dejar un meta.json a medias
+    meta_path = os.path.join(path, "meta.json")
+    with open(meta_path + ".tmp", "w", encoding="utf-8") as meta_file:
+        json.dump(meta, meta_file)
+    os.replace(meta_path + ".tmp", meta_path)
+
+def load_results(path):
+    """Abre las columnas de una carpeta de resultados sin cargarlas en memoria.
+
+    Args:
+        path (str): La carpeta de resultados.
+
+    Returns:
+        dict[str, np.ndarray]: Cada columna mapeada desde su archivo.
+    """
+
+    count = read_count(path)
+    columns = {}
+
+    for (name, dtype) in RESULT_COLUMNS:
+        if count == 0:
+            columns[name] = np.empty(0, dtype=dtype)
+        else:
+            columns[name] = np.memmap(os.path.join(path, name + ".bin"), dtype=dtype, mode="r", shape=(count,))
+
+    return columns
+
+def summarize_results(columns):
+    """Calcula los agregados de un conjunto de partidas con operaciones vectorizadas.
+
+    Args:
+        columns (dict[str, np.ndarray]): Las columnas de resultados.
+
+    Returns:
+        dict: Los agregados de las partidas.
+    """
+
+    games = len(columns["win"])
+    if games == 0:
+        return {"games": 0}
+
+    win = columns["win"].astype(bool)
+    loss_reason = columns["loss_reason"]
+
+    return {
+        "games": games,
+        "wins": int(win.sum()),
+        "win_rate": float(win.mean() * 100),
+        "rescued": int(columns["rescued"].sum(dtype=np.int64)),
+        "max_rescued": int(columns["rescued"].max()),
+        "rescued_histogram": np.bincount(columns["rescued"], minlength=8).tolist(),
+        "dead": int(columns["scared"].sum(dtype=np.int64)),
+        "damage": int(columns["damage_points"].sum(dtype=np.int64)),
+        "mean_damage": float(columns["damage_points"].mean()),
+        "dead_losses": int((loss_reason == LOSS_SCARED).sum()),
+        "damage_losses": int((loss_reason == LOSS_DAMAGE).sum()),
+        "max_turns_losses": int((loss_reason == LOSS_MAX_TURNS).sum()),
+        "mean_steps": float(columns["num_steps"].mean()),
+        "p99_steps": float(np.percentile(columns["num_steps"], 99)),
+        "naive_games": int((columns["mode"] == 1).sum()),
+    }
+
+if __name__ == "__main__":
+    # Uso: python results.py <carpeta de resultados>
+    for (key, value) in summarize_results(load_results(sys.argv[1])).items():
+        print(f"{key}: {value}")
@@ -0,0 +1,255 @@
+from imports import *
+
+import json
+import multiprocessing
+import os
+from collections import namedtuple
+
+from profiling import merge_timings
+from search_stats import merge_stats
+
+from typing import TYPE_CHECKING
+if TYPE_CHECKING:
+    from map import *
+
+# Resultado mínimo de una partida, es lo único que regresa cada proceso
+# timings y search_stats solo se llenan si la partida se jugó con profile
+GameOutcome = namedtuple("GameOutcome", ["seed", "mode", "win", "rescued", "scared", "damage_points", "num_steps", "loss_reason", "timings", "search_stats"], defaults=[None, None])
+
+def game_seed(base_seed, index):
+    """Deriva la semilla de una partida a partir de la semilla base y su índice,
+    así la partida N es la misma sin importar qué proceso la juegue.
+
+    Args:
+        base_seed (int): La semilla base del lote.
+        index (int): El índice global de la partida dentro del lote.
+
+    Returns:
+        int: La semilla de la partida.
+    """
+
+    sequence = np.random.SeedSequence(base_seed, spawn_key=(index,))
+    return int(sequence.generate_state(1, np.uint64)[0])
+
+def play_game(task):
+    """Juega una partida completa dentro del proceso actual.
+
+    Args:
+        task (tuple): Si la partida es naive, su semilla y opcionalmente
+            la Strategy a usar y si se miden los tiempos por fase.
+
+    Returns:
+        GameOutcome: El resultado de la partida.
+    """
+
+    (naive, seed, *options) = task
+    simulation = Map(naive, seed, *options, payloads=False) # Solo interesa el resultado
+    result = simulation.run_to_completion()
+
+    return GameOutcome(
+        seed,
+        int(naive),
+        result.win,
+        result.rescued,
+        result.scared,
+        result.damage,
+        result.steps,
+        result.loss_reason,
+        simulation.timers.to_dict() if simulation.timers.enabled else None,
+        simulation.search_stats.to_dict() if simulation.search_stats.enabled else None
+    )
+
+class RunSummary:
+    """Acumula los resultados de las partidas de una corrida."""
+
+    def __init__(self, run, iterations):
+        """Constructor del resumen.
+
+        Args:
+            run (int): El índice de la corrida.
+            iterations (int): Las partidas que tiene la corrida.
+        """
+
+        self.run = run
+        self.iterations = iterations
+        self.played = 0
+
+        self.rescued = 0
+        self.max_person = 0
+        self.dead = 0
+        self.damage = 0
+        self.wins = 0
+
+        self.dead_losses = 0
+        self.damage_losses = 0
+
+        self.timings = {} # Tiempos por fase, si las partidas se midieron
+        self.search_stats = {} # Contadores de las búsquedas, igual
+
+    def add(self, outcome: GameOutcome):
+        """Añade el resultado de una partida a la corrida."""
+
+        self.played += 1
+        self.rescued += outcome.rescued
+        self.dead += outcome.scared
+        self.damage += outcome.damage_points
+        if outcome.win:
+            self.wins += 1
+
+        if outcome.rescued > self.max_person:
+            self.max_person = outcome.rescued
+
+        if outcome.damage_points >= 24:
+            self.damage_losses += 1
+        elif not outcome.win:
+            self.dead_losses += 1
+
+        if outcome.timings is not None:
+            merge_timings(self.timings, outcome.timings)
+
+        if outcome.search_stats is not None:
+            merge_stats(self.search_stats, outcome.search_stats)
+
+    def win_rate(self):
+        """Regresa el porcentaje de victorias de las partidas jugadas."""
+
+        if self.played == 0:
+            return 0
+
+        return self.wins / self.played * 100
+
+    def to_dict(self):
+        """Regresa los acumulados como diccionario, para el checkpoint."""
+
+        return dict(self.__dict__)
+
+    @staticmethod
+    def from_dict(values):
+        """Reconstruye un resumen guardado con to_dict."""
+
+        summary = RunSummary(values["run"], values["iterations"])
+        summary.__dict__.update(values)
+        return summary
+
+def load_checkpoint(path):
+    """Lee el checkpoint de un lote, o regresa None si no existe."""
+
+    if path is None or not os.path.exists(path):
+        return None
+
+    with open(path, "r", encoding="utf-8") as checkpoint_file:
+        return json.load(checkpoint_file)
+
+def save_checkpoint(path, state):
+    """Guarda el checkpoint de un lote sin dejar nunca un archivo a medias."""
+
+    with open(path + ".tmp", "w", encoding="utf-8") as checkpoint_file:
+        json.dump(state, checkpoint_file)
+    os.replace(path + ".tmp", path)
+
+def default_chunksize(iterations, processes):
+    """Calcula cuántas partidas se mandan juntas a cada proceso, para
+    no pagar la comunicación por cada partida sin dejar núcleos sin trabajo.
+    """
+
+    return max(1, iterations // (processes * 4))
+
+def run_batch(runs, iterations, naive, seed=None, sink=None, processes=None, chunksize=None, checkpoint=None, checkpoint_every=1000, profile=False):
+    """Juega todas las corridas repartiendo las partidas en un pool de procesos.
+
+    Las partidas de todas las corridas se mandan como un solo flujo de trabajo,
+    así ningún núcleo se queda esperando a que termine la corrida anterior.
+
+    Con checkpoint, cada checkpoint_every partidas se guardan los resúmenes
+    terminados, los acumulados de la corrida en curso, la semilla base y el
+    índice de la siguiente partida. Como la semilla de cada partida solo
+    depende de la semilla base y su índice, al reanudar se continúa desde ahí
+    sin repetir partidas y con los mismos resultados finales.
+
+    Args:
+        runs (int): La cantidad de corridas.
+        iterations (int): Las partidas de cada corrida.
+        naive (bool): Bandera que dicta si las partidas son naive o con strat.
+        seed (int): La semilla base del lote, None para usar una aleatoria.
+        sink (ResultSink): Donde guardar el registro de cada partida, opcional.
+        processes (int): Los procesos a usar, por defecto todos los núcleos.
+        chunksize (int): Las partidas que se mandan juntas a cada proceso.
+        checkpoint (str): El archivo de checkpoint, None para no guardar.
+        checkpoint_every (int): Cada cuántas partidas se guarda el checkpoint.
+        profile (bool): Si se miden los tiempos por fase y se cuentan las
+            búsquedas, quedan en RunSummary.timings y RunSummary.search_stats.
+
+    Yields:
+        RunSummary: El resumen de cada corrida, en orden.
+    """
+
+    if processes is None:
+        processes = multiprocessing.cpu_count()
+
+    if chunksize is None:
+        chunksize = default_chunksize(iterations, processes)
+
+    if seed is None:
+        seed = np.random.SeedSequence().entropy
+
+    finished = []
+    summary = RunSummary(0, iterations)
+    start = 0
+
+    state = load_checkpoint(checkpoint)
+    if state is not None:
+        if (state["runs"], state["iterations"], state["naive"]) != (runs, iterations, naive):
+            raise ValueError("El checkpoint pertenece a un lote con otros parámetros")
+
+        seed = state["seed"]
+        finished = [RunSummary.from_dict(values) for values in state["finished"]]
+        summary = RunSummary.from_dict(state["current"])
+        start = state["next_game"]
+
+        # Se descartan los registros de partidas posteriores al checkpoint
+        if sink is not None:
+            sink.truncate(state["records"])
+
+    def save():
+        if sink is not None:
+            sink.flush()
+
+        save_checkpoint(checkpoint, {
+            "runs": runs,
+            "iterations": iterations,
+            "naive": naive,
+            "seed": seed,
+            "next_game": next_game,
+            "records": sink.count if sink is not None else 0,
+            "finished": [finished_summary.to_dict() for finished_summary in finished],
+            "current": summary.to_dict()
+        })
+
+    # Las corridas que ya habían terminado no se vuelven a jugar
+    for finished_summary in finished:
+        yield finished_summary
+
+    next_game = start
+    games = ((naive, game_seed(seed, i), None, profile) for i in range(start, runs * iterations))
+
+    with multiprocessing.Pool(processes) as pool:
+        # imap conserva el orden, por lo que cada bloque de iterations es una corrida
+        for outcome in pool.imap(play_game, games, chunksize):
+            summary.add(outcome)
+            next_game += 1
+
+            if sink is not None:
+                sink.append(outcome)
+
+            if summary.played == iterations:
+                finished.append(summary)
+                summary = RunSummary(summary.run + 1, iterations)
+
+            if checkpoint is not None and next_game % checkpoint_every == 0:
+                save()
+
+            if summary.played == 0:
+                yield finished[-1]
+
+    if checkpoint is not None:
+        save()
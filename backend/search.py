@@ -8,44 +8,71 @@ if TYPE_CHECKING:
     from map import *
     from actions import *
 
-class MapNode:
-    """Un nodo dentro del mapa que te dicta qué nodo se ocupa
-    para llegar a éste.
-    """
-    def __init__(self, x, y, current_cost, parent: "MapNode"):
-        self.x = x
-        self.y = y
-        self.current_cost = current_cost
-        self.parent = parent
-
-class PriorityQueue:
-    """Priority queue para ordenar las próximas casillas a visitar.
+UNREACHED = 1000 # El costo de una casilla a la que no se llegó
+
+# Las casillas se guardan en arreglos planos con el índice x * height + y,
+# así comparar índices es lo mismo que comparar (x, y) y la cola desempata
+# en el mismo orden que con las tuplas. Cada búsqueda crea sus propios
+# arreglos: el servidor juega varias partidas a la vez en hilos distintos.
+
+class SearchResult:
+    """El resultado de una búsqueda: el costo y el padre de cada casilla.
+
+    Los arreglos son de la búsqueda que lo creó, así que el resultado sigue
+    siendo válido después de otras búsquedas (por ejemplo, en la caché).
+    Los caminos solo se reconstruyen cuando se piden.
     """
-    def __init__(self):
-        self.__data = []
-
-    # Verifica si está vacía
-    def empty(self):
-        return not self.__data
-    
-    # Inserta un nuevo elemento
-    def push(self, priority, value):
-        heapq.heappush(self.__data, (priority, value))
-
-    # Elimina el elemento más próximo
-    def pop(self):
-        if self.__data: # No está vacío
-            heapq.heappop(self.__data)
-        else:
-            raise Exception("No such element")
-        
-    # Obtiene el próximo elemento
-    def top(self):
-        if self.__data: # No está vacío
-            return self.__data[0]
-        else:
-            raise Exception("No such element")
-        
+
+    def __init__(self, start_x, start_y, height, costs, parents, expanded=0, stale=0, pushed=0):
+        self.start_x = start_x
+        self.start_y = start_y
+        self.height = height
+        self.costs = costs
+        self.parents = parents
+        self.expanded = expanded # Las casillas que se expandieron en la búsqueda
+        self.stale = stale # Las entradas viejas que se sacaron de la cola
+        self.pushed = pushed # Las entradas que se metieron a la cola
+
+    def cost(self, x, y):
+        """Regresa el costo de llegar a (x, y), o UNREACHED."""
+        return self.costs[x * self.height + y]
+
+    def parent(self, x, y):
+        """Regresa la casilla anterior a (x, y) en el camino, o None."""
+
+        index = self.parents[x * self.height + y]
+        if index == -1:
+            return None
+
+        return divmod(index, self.height)
+
+    def path(self, start_x, start_y, end_x, end_y, starts_from_hero):
+        """Regresa la deque de casillas entre start y end, siguiendo los padres
+        desde end. Igual que generate_deque con una matriz de nodos.
+        """
+
+        height = self.height
+        parents = self.parents
+
+        next_steps = deque()
+        start = start_x * height + start_y
+        current = end_x * height + end_y
+
+        # Sigue los pasos marcados por los padres de los nodos
+        while current != start:
+            # Dependiendo del tipo en que se tiene que añadir, hace un append u otro
+            if starts_from_hero:
+                next_steps.appendleft(divmod(current, height))
+            else:
+                next_steps.append(divmod(current, height))
+
+            if parents[current] == -1:
+                break
+
+            current = parents[current]
+
+        return next_steps
+
 def neigbors_with_cost(map: "Map", x, y, movement_type):
     """Obtiene los vecinos de una casilla, con el costo
     para poder llegar a éstas.
@@ -53,20 +80,22 @@ def neigbors_with_cost(map: "Map", x, y, movement_type):
 
     neighbors = []
 
+    strategy = map.strategy
+
     multiplier = 1
     if movement_type == 2: # En caso de que su intención sea quitar fantasmas
-        multiplier = 0.8
+        multiplier = strategy.ghost_multiplier
 
     # Las celdas adyacentes
-    adyacent = map.walls.get_neighbors(x, y)
-    doors = map.walls.get_closed_neighbors(x, y)
+    adyacent = map.walls.open_neighbors[y][x]
+    doors = map.walls.door_neighbors[y][x]
 
     for neighbor in adyacent:
         current = map.ghosts.get_on(neighbor[0], neighbor[1])
         if current == 0:
             neighbors.append((neighbor[0], neighbor[1], 1))
         else:
-            if current == 2: multiplier /= 3
+            if current == 2: multiplier /= strategy.ghost_divisor
             neighbors.append((neighbor[0], neighbor[1], current * multiplier)) # Le aumenta su "costo" si quiere ir a un poi, para evitar fuegos
 
     for neighbor in doors:
@@ -74,143 +103,316 @@ def neigbors_with_cost(map: "Map", x, y, movement_type):
         if current == 0:
             neighbors.append((neighbor[0], neighbor[1], 2))
         else:
-            if current == 2: multiplier /= 3
+            if current == 2: multiplier /= strategy.ghost_divisor
             neighbors.append((neighbor[0], neighbor[1], current * multiplier + 1)) # Le aumenta su "costo" si quiere ir a un poi, para evitar fuegos
 
     return neighbors
 
-def start_matrix(map: "Map"):
-    """Inicializa la matriz de los nodos:
+def generate_deque(matrix: SearchResult, start_x, start_y, end_x, end_y, starts_from_hero):
+    """Genera la deque que dicta que casillas pasar para llegar de un nodo a otro
+    """
+
+    return matrix.path(start_x, start_y, end_x, end_y, starts_from_hero)
+
+def dijkstra(map: "Map", start_x, start_y, movement_type, targets=None):
+    """Calcula el costo y el camino para ir de un punto a todos los demás.
+
+    Con targets, la búsqueda se detiene en cuanto ninguna casilla pendiente
+    puede darle a un objetivo un valor (costo - bono) menor o igual al del
+    mejor objetivo ya alcanzado. Las casillas expandidas quedan igual que en
+    la búsqueda completa; las demás solo tienen costos tentativos.
 
     Args:
         map (Map): El mapa del tablero
+        start_x (int): Posición en X inicial
+        start_y (int): Posición en Y inicial
+        movement_type (int): El tipo de movimiento
+        targets (dict[int, float]): El bono que se le resta al costo de cada
+            objetivo, por índice de casilla.
 
     Returns:
-        list[list[MapNode]]: Los nodos del mapa
+        SearchResult: Los costos y padres de cada casilla
     """
 
     height = len(map.ghosts.dashboard)
-    width = len(map.ghosts.dashboard[0])
+    size = height * len(map.ghosts.dashboard[0])
 
-    # Línea de código creada con ChatGPT, no estoy acostumbrado a trabajar con matrices en Python
-    return [[MapNode(x, y, 1000, None) for x in range(width)] for y in range(height)]
+    costs = [UNREACHED] * size
+    parents = [-1] * size
+    settled = bytearray(size)
 
-def generate_deque(matrix: list[list[MapNode]], start_x, start_y, end_x, end_y, starts_from_hero):
-    """Genera la deque que dicta que casillas pasar para llegar de un nodo a otro
-    """
+    # La cola guarda (costo, índice), igual que (costo, (x, y))
+    start = start_x * height + start_y
+    costs[start] = 0
+    left_to_visit = [(0, start)]
+    expanded = 0
+    stale = 0
+    stopped = 0 # La entrada que se sacó al detenerse antes, si se detuvo
 
-    next_steps = deque()
-    current_x = end_x
-    current_y = end_y
+    if targets is not None:
+        best = UNREACHED
+        max_bonus = max(targets.values(), default=0)
 
-    # Sigue los pasos marcados por los padres de los nodos
-    while (current_x, current_y) != (start_x, start_y):
-        # Dependiendo del tipo en que se tiene que añadir, hace un append u otro
-        if starts_from_hero:
-            next_steps.appendleft((current_x, current_y))
-        else:
-            next_steps.append((current_x, current_y))
+    # Corre hasta ya no poder más
+    while left_to_visit:
+        (current_cost, current) = heapq.heappop(left_to_visit)
 
-        temp_x = current_x
+        # Una entrada vieja de una casilla a la que ya se llegó más barato
+        if settled[current]:
+            stale += 1
+            continue
 
-        if matrix[current_y][current_x].parent == None:
-            break
+        if targets is not None:
+            # Ningún objetivo pendiente puede empatar o mejorar al mejor
+            if best < UNREACHED and current_cost - max_bonus > best:
+                stopped = 1
+                break
 
-        current_x = matrix[current_y][current_x].parent.x
-        current_y = matrix[current_y][temp_x].parent.y
+            if current in targets:
+                best = min(best, current_cost - targets[current])
 
-    return next_steps
+        settled[current] = 1
+        expanded += 1
 
-def dijkstra(map: "Map", start_x, start_y, movement_type):
-    """Genera una matriz de las posiciones necesarias
-    para ir de un punto a otros.
+        (current_x, current_y) = divmod(current, height)
 
-    Args:
-        map (Map): El mapa del tablero
-        start_x (_type_): Posición en X inicial
-        start_y (_type_): Posición en Y inicial
-    """
+        for (x, y, cost) in neigbors_with_cost(map, current_x, current_y, movement_type):
+            neighbor = x * height + y
 
-    # Inicializa el mapa, la queue y su primera posición
-    matrix = start_matrix(map)
-    matrix[start_y][start_x] = MapNode(start_x, start_y, 0, None)
-    left_to_visit = PriorityQueue()
-    left_to_visit.push(0, (start_x, start_y))
+            if current_cost + cost < costs[neighbor]: # Se encuentra una nueva opción para llegar a esa casilla
+                costs[neighbor] = current_cost + cost
+                parents[neighbor] = current
+                heapq.heappush(left_to_visit, (costs[neighbor], neighbor))
 
-    # Corre hasta ya no poder más
-    while not left_to_visit.empty():
-        (current_cost, (current_x, current_y)) = left_to_visit.top()
-        left_to_visit.pop()
+    # Cada entrada metida se expandió, era vieja o sigue en la cola
+    pushed = expanded + stale + stopped + len(left_to_visit)
+    return SearchResult(start_x, start_y, height, costs, parents, expanded, stale, pushed)
 
-        neighbors = neigbors_with_cost(map, current_x, current_y, movement_type)
-        for neighbor in neighbors:
-            (x, y, cost) = neighbor
+def recorded(map: "Map", caller, result):
+    """Cuenta una búsqueda que se corrió en las estadísticas del mapa y en
+    el PlanningContext, y regresa su resultado.
+    """
 
-            if current_cost + cost < matrix[y][x].current_cost: # Se encuentra una nueva opción para llegar a esa casilla
-                matrix[y][x].current_cost = current_cost + cost
-                matrix[y][x].parent = matrix[current_y][current_x]
-                left_to_visit.push(matrix[y][x].current_cost, (x, y))
+    map.search_stats.record(caller, result)
+    map.planning.searched()
+    return result
 
-    return matrix
+def cached_dijkstra(map: "Map", start_x, start_y, movement_type, caller, targets=None, query=None):
+    """Igual que dijkstra, pero reutiliza el resultado si el tablero
+    no ha cambiado desde la última vez que se pidió.
 
-def dijkstra_to(map: "Map", start_x, start_y, end_x, end_y, movement_type):
-    """Utilizando el algoritmo de dijkstra, regresa una deque
-    de las casillas necesarias para llegar de una casilla a otra.
+    El resultado se comparte con la caché, no se debe modificar.
+
+    Args:
+        caller (str): Quién pide la búsqueda, para las estadísticas.
+        query (str): El nombre de la consulta con targets (por ejemplo
+            "exits"), para no mezclar búsquedas parciales con completas.
+            Los objetivos deben depender solo del tablero.
     """
 
-    matrix = dijkstra(map, start_x, start_y, movement_type)
-    return generate_deque(matrix, start_x, start_y, end_x, end_y, True)
+    key = ((start_x, start_y), movement_type, map.walls.version, map.ghosts.version, query)
 
-def closest_poi(map: "Map", hero_id):
-    """Obtiene el camino para llegar al POI más cercano en caso
-    de tener uno, en caso contrario, regresa una deque vacía.
+    matrix = map.path_cache.get(key)
+    if matrix is None:
+        matrix = recorded(map, caller, dijkstra(map, start_x, start_y, movement_type, targets))
+        map.path_cache.put(key, matrix)
+
+    return matrix
+
+def multi_source_dijkstra(map: "Map", sources, movement_type):
+    """Corre dijkstra desde varias casillas en una sola pasada.
+
+    Los costos de los vecinos no dependen del origen, así que se calculan
+    una sola vez por casilla y se comparten. Cada origen conserva sus
+    propios arreglos y la cola ordena por (costo, origen, casilla), por lo
+    que cada resultado queda igual que con dijkstra.
 
     Args:
         map (Map): El mapa del tablero
-        hero_id (int): El ID del héroe a verificar
+        sources (list[tuple[int, int]]): Las casillas de origen
+        movement_type (int): El tipo de movimiento
+
+    Returns:
+        list[SearchResult]: El resultado de cada origen
     """
 
-    closest_to_pois = PriorityQueue()
+    height = len(map.ghosts.dashboard)
+    size = height * len(map.ghosts.dashboard[0])
+
+    costs = [[UNREACHED] * size for _ in sources]
+    parents = [[-1] * size for _ in sources]
+    settled = [bytearray(size) for _ in sources]
+    expanded = [0] * len(sources)
+    stale = [0] * len(sources)
+    neighbors_of = {}
+    left_to_visit = []
+
+    for (i, (start_x, start_y)) in enumerate(sources):
+        start = start_x * height + start_y
+        costs[i][start] = 0
+        left_to_visit.append((0, i, start))
+    heapq.heapify(left_to_visit)
+
+    while left_to_visit:
+        (current_cost, i, current) = heapq.heappop(left_to_visit)
+
+        if settled[i][current]:
+            stale[i] += 1
+            continue
+        settled[i][current] = 1
+        expanded[i] += 1
+
+        neighbors = neighbors_of.get(current)
+        if neighbors is None:
+            (current_x, current_y) = divmod(current, height)
+            neighbors = [(x * height + y, cost) for (x, y, cost) in neigbors_with_cost(map, current_x, current_y, movement_type)]
+            neighbors_of[current] = neighbors
+
+        source_costs = costs[i]
+        for (neighbor, cost) in neighbors:
+            if current_cost + cost < source_costs[neighbor]:
+                source_costs[neighbor] = current_cost + cost
+                parents[i][neighbor] = current
+                heapq.heappush(left_to_visit, (source_costs[neighbor], i, neighbor))
+
+    return [
+        SearchResult(start_x, start_y, height, costs[i], parents[i], expanded[i], stale[i], expanded[i] + stale[i])
+        for (i, (start_x, start_y)) in enumerate(sources)
+    ]
+
+class PoiField:
+    """Las distancias de todos los POIs a cada casilla, calculadas
+    con una sola pasada de multi_source_dijkstra, y a qué POI le toca ir a
+    cada héroe.
+
+    Las distancias solo dependen del tablero, así que el campo se guarda en
+    el PlanningContext y lo comparten los héroes. La búsqueda se corre
+    hasta que algo necesita las distancias (ver get_matrices): a un héroe
+    que ya se sabe que no tiene POI no le hace falta. Con la asignación
+    "optimal" de la Strategy, la asignación la guarda el PlanningContext;
+    con "nearest" se vuelve a calcular cuando se mueve un héroe o cambia
+    quién lleva víctima.
+    """
+
+    def __init__(self, map: "Map"):
+        """Crea el campo con el estado actual del tablero, sin calcularlo.
+
+        Args:
+            map (Map): El mapa del tablero
+        """
+
+        self.map = map
+        self.coords = list(map.poi.current_poi_coords)
+        self.matrices = None # Se calculan hasta que se piden, ver get_matrices
+
+        self.assignment = {}
+        self.heroes = None # Las posiciones y víctimas con las que se asignó
 
-    # Para cada POI
-    i = 0
-    for poi in map.poi.current_poi_coords:
-        poi_matrix = dijkstra(map, poi[0], poi[1], 2)
-        heroes_distance = PriorityQueue()
+    def get_matrices(self):
+        """Regresa las distancias de cada POI, calculándolas la primera vez
+        que se piden.
+        """
 
-        # Obtiene la distancia de cada heroe del poi actual
-        for hero in map.heroes_array:
-            if hero.has_victim == False:
-                heroes_distance.push(poi_matrix[hero.y][hero.x].current_cost, hero.id)
+        if self.matrices is not None:
+            return self.matrices
 
-        # TODO: El fantasma no mata al poi -> unity
+        map = self.map
+        self.matrices = multi_source_dijkstra(map, self.coords, 2)
+        map.search_stats.record("closest_poi", *self.matrices)
+        map.planning.searched()
 
-        closest_distance = heroes_distance.top()[0] # Obtiene la distancia que el héroe más cercano tiene al poi
+        return self.matrices
 
-        closest_heroes = []
+    def assign(self):
+        """Le asigna a cada héroe sin víctima el primer POI del que es
+        (o empata como) el héroe libre más cercano, la asignación "nearest".
 
-        while not heroes_distance.empty() and heroes_distance.top()[0] == closest_distance:
-            closest_heroes.append(heroes_distance.top()[1])
-            heroes_distance.pop()
+        Returns:
+            dict[int, int]: El índice del POI de cada héroe con uno asignado.
+        """
 
-        # Añade los índices de los héroes más cercanos hacia un poi
-        if hero_id in closest_heroes:
-            closest_to_pois.push(poi_matrix[poi[1]][poi[0]].current_cost, (i, poi_matrix))
+        assignment = {}
 
-        i += 1
+        for (i, matrix) in enumerate(self.get_matrices()):
+            distances = [(matrix.cost(hero.x, hero.y), hero.id) for hero in self.map.heroes_array if not hero.has_victim]
+            if not distances:
+                break
 
-    next_steps = deque()
+            closest_distance = min(distances)[0]
 
-    # Si no está vacía, significa que es el más cercano a alguno
-    if not closest_to_pois.empty():
-        (heroes_len, (poi_id, poi_matrix)) = closest_to_pois.top()
-        hero_id -= 1
+            for (distance, hero_id) in distances:
+                if distance == closest_distance and hero_id not in assignment:
+                    assignment[hero_id] = i
 
-        next_steps = generate_deque(poi_matrix, map.poi.current_poi_coords[poi_id][0], map.poi.current_poi_coords[poi_id][1], map.heroes_array[hero_id].x, map.heroes_array[hero_id].y, False)
+        return assignment
 
-        next_steps.append(map.poi.current_poi_coords[poi_id])
+    def path(self, hero_id):
+        """Regresa el camino del héroe a su POI asignado, o una deque
+        vacía si no tiene.
+        """
+
+        if self.map.strategy.assignment == "optimal":
+            self.assignment = self.map.planning.poi_assignment(self)
+        else:
+            heroes = (tuple(self.map.positions), tuple(hero.has_victim for hero in self.map.heroes_array))
+            if heroes != self.heroes:
+                self.assignment = self.assign()
+                self.heroes = heroes
+
+        if hero_id not in self.assignment:
+            return deque()
+
+        poi_id = self.assignment[hero_id]
+        (poi_x, poi_y) = self.coords[poi_id]
+        hero = self.map.heroes_array[hero_id - 1]
+
+        next_steps = generate_deque(self.get_matrices()[poi_id], poi_x, poi_y, hero.x, hero.y, False)
+
+        next_steps.append(self.coords[poi_id])
         next_steps.popleft()
-        
+
+        return next_steps
+
+
+def dijkstra_to(map: "Map", start_x, start_y, end_x, end_y, movement_type, engine="heap"):
+    """Regresa una deque de las casillas necesarias para llegar de una
+    casilla a otra.
+
+    Args:
+        engine (str): "heap" para un dijkstra completo, que desempata igual
+            que siempre, o "astar"/"bidirectional" para solo expandir lo
+            necesario (ver astar.py). Estos pueden regresar otro camino del
+            mismo costo.
+    """
+
+    from astar import astar, bidirectional_dijkstra
+
+    if engine == "astar":
+        matrix = recorded(map, "dijkstra_to", astar(map, start_x, start_y, end_x, end_y, movement_type))
+    elif engine == "bidirectional":
+        matrix = recorded(map, "dijkstra_to", bidirectional_dijkstra(map, start_x, start_y, end_x, end_y, movement_type))
+    else:
+        matrix = cached_dijkstra(map, start_x, start_y, movement_type, "dijkstra_to")
+
+    next_steps = generate_deque(matrix, start_x, start_y, end_x, end_y, True)
+    map.search_stats.path("dijkstra_to", next_steps)
+    return next_steps
+
+def closest_poi(map: "Map", hero_id):
+    """Obtiene el camino para llegar al POI más cercano en caso
+    de tener uno, en caso contrario, regresa una deque vacía.
+
+    Args:
+        map (Map): El mapa del tablero
+        hero_id (int): El ID del héroe a verificar
+    """
+
+    # TODO: El fantasma no mata al poi -> unity
+
+    # Todos los POIs se calculan en una sola pasada, compartida por los héroes
+    key = ("poi", tuple(map.poi.current_poi_coords))
+    next_steps = map.planning.field(key, lambda: PoiField(map)).path(hero_id)
+    map.search_stats.path("closest_poi", next_steps)
     return next_steps
 
 def closest_ghost(map: "Map", x, y):
@@ -223,17 +425,26 @@ def closest_ghost(map: "Map", x, y):
         y (int): La coordenada Y del héroe
     """
      
-    matrix = dijkstra(map, x, y, 2)
+    height = len(map.ghosts.dashboard)
+    bonus = [len(map.ghosts.get_ghosty_neighbors(ghost[0], ghost[1])) * map.strategy.ghost_neighbor_bonus for ghost in map.ghosts.ghost_list]
+
+    # La búsqueda se detiene en cuanto ya no puede cambiar el fantasma elegido
+    targets = {}
+    for (ghost, ghost_bonus) in zip(map.ghosts.ghost_list, bonus):
+        targets[ghost[0] * height + ghost[1]] = ghost_bonus
+    matrix = cached_dijkstra(map, x, y, 2, "closest_ghost", targets=targets, query="ghosts")
 
     closest_ghost = (5, 4, 1000)
 
-    for ghost in map.ghosts.ghost_list:
-        value = matrix[ghost[1]][ghost[0]].current_cost - len(map.ghosts.get_ghosty_neighbors(ghost[0], ghost[1])) * 3
+    for (ghost, ghost_bonus) in zip(map.ghosts.ghost_list, bonus):
+        value = matrix.cost(ghost[0], ghost[1]) - ghost_bonus
 
         if value < closest_ghost[2]:
             closest_ghost = (ghost[0], ghost[1], value)
 
-    return generate_deque(matrix, x, y, closest_ghost[0], closest_ghost[1], True)
+    next_steps = generate_deque(matrix, x, y, closest_ghost[0], closest_ghost[1], True)
+    map.search_stats.path("closest_ghost", next_steps)
+    return next_steps
 
 def closest_exit(map: "Map", x, y):
     """Obtiene el camino para llegar a la salida más cercana.
@@ -244,14 +455,19 @@ def closest_exit(map: "Map", x, y):
         y (int): La coordenada Y del héroe
     """
 
-    matrix = dijkstra(map, x, y, 1)
+    # La búsqueda se detiene en cuanto se alcanza la salida más cercana
+    height = len(map.ghosts.dashboard)
+    targets = {exit[0] * height + exit[1]: 0 for exit in map.walls.exits}
+    matrix = cached_dijkstra(map, x, y, 1, "closest_exit", targets=targets, query="exits")
 
     closest = (0, 0, 1000)
 
     for exit in map.walls.exits:
-        value = matrix[exit[1]][exit[0]].current_cost
+        value = matrix.cost(exit[0], exit[1])
 
         if value < closest[2]:
             closest = (exit[0], exit[1], value)
 
-    return generate_deque(matrix, x, y, closest[0], closest[1], True)
\ No newline at end of file
+    next_steps = generate_deque(matrix, x, y, closest[0], closest[1], True)
+    map.search_stats.path("closest_exit", next_steps)
+    return next_steps
\ No newline at end of file
@@ -0,0 +1,123 @@
+# Quién pide las búsquedas, ver search.py
+CALLERS = [
+    "closest_poi",
+    "closest_ghost",
+    "closest_exit",
+    "dijkstra_to"
+]
+
+# Lo que se cuenta de cada caller
+COUNTERS = [
+    "calls", # Búsquedas que se corrieron (las reutilizadas no cuentan)
+    "popped", # Casillas sacadas de la cola, incluidas las viejas
+    "stale", # Entradas viejas de la cola, de casillas ya expandidas
+    "pushed", # Entradas metidas a la cola
+    "paths", # Caminos que se regresaron, de búsquedas nuevas o reutilizadas
+    "path_length" # La suma de las casillas de esos caminos
+]
+
+def empty_stats():
+    """Regresa los contadores de todos los callers en cero."""
+
+    return {caller: dict.fromkeys(COUNTERS, 0) for caller in CALLERS}
+
+class SearchStats:
+    """Contadores del trabajo de las búsquedas por caller, del turno actual
+    y de toda la partida.
+
+    Se usa como:
+        result = dijkstra(...)
+        stats.record("closest_exit", result)
+        ...
+        stats.path("closest_exit", next_steps)
+
+    Apagado, record() y path() no hacen nada, así que solo cuesta la llamada.
+    """
+
+    def __init__(self, enabled=False):
+        """Constructor de los contadores.
+
+        Args:
+            enabled (bool): Si se cuentan las búsquedas o no.
+        """
+
+        self.enabled = enabled
+        self.totals = empty_stats()
+        self.turn = empty_stats() # Solo los del turno actual, ver start_turn
+
+    def start_turn(self):
+        """Reinicia los contadores del turno, al empezar el turno de un héroe."""
+
+        if self.enabled:
+            self.turn = empty_stats()
+
+    def record(self, caller, *results):
+        """Suma una búsqueda con los contadores de sus resultados, por
+        ejemplo los de cada origen de multi_source_dijkstra.
+
+        Args:
+            caller (str): Quién pidió la búsqueda.
+            results (SearchResult): Los resultados de la búsqueda.
+        """
+
+        if not self.enabled:
+            return
+
+        for stats in (self.totals[caller], self.turn[caller]):
+            stats["calls"] += 1
+            for result in results:
+                stats["popped"] += result.expanded + result.stale
+                stats["stale"] += result.stale
+                stats["pushed"] += result.pushed
+
+    def path(self, caller, next_steps):
+        """Suma un camino regresado por el caller."""
+
+        if not self.enabled:
+            return
+
+        for stats in (self.totals[caller], self.turn[caller]):
+            stats["paths"] += 1
+            stats["path_length"] += len(next_steps)
+
+    def to_dict(self):
+        """Regresa los contadores de toda la partida."""
+
+        return {caller: dict(stats) for (caller, stats) in self.totals.items()}
+
+    def turn_dict(self):
+        """Regresa los contadores del turno actual."""
+
+        return {caller: dict(stats) for (caller, stats) in self.turn.items()}
+
+def merge_stats(total, stats):
+    """Suma unos contadores en formato to_dict a otros, por ejemplo los de
+    cada partida a los de su corrida.
+
+    Args:
+        total (dict): Los contadores acumulados, se modifica.
+        stats (dict): Los contadores a sumar.
+
+    Returns:
+        dict: El acumulado.
+    """
+
+    for (caller, counters) in stats.items():
+        caller_total = total.setdefault(caller, dict.fromkeys(COUNTERS, 0))
+        for (counter, value) in counters.items():
+            caller_total[counter] = caller_total.get(counter, 0) + value
+
+    return total
+
+def format_stats(stats):
+    """Regresa los contadores de cada caller como una tabla de texto, con
+    los promedios por búsqueda y por camino.
+    """
+
+    lines = [f"{'caller':<15}{'calls':>10}{'popped':>12}{'stale':>10}{'pushed':>12}{'pop/call':>10}{'path len':>10}"]
+    for (caller, counters) in stats.items():
+        per_call = counters["popped"] / counters["calls"] if counters["calls"] else 0
+        path_length = counters["path_length"] / counters["paths"] if counters["paths"] else 0
+        lines.append(f"{caller:<15}{counters['calls']:>10}{counters['popped']:>12}{counters['stale']:>10}{counters['pushed']:>12}{per_call:>10.1f}{path_length:>10.1f}")
+
+    return "\n".join(lines)
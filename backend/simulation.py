@@ -1,48 +1,68 @@
 from imports import *
 from search import *
+from runner import run_batch
+from adaptive import run_adaptive
+from results import ResultSink
+from profiling import merge_timings, format_timings
+from search_stats import merge_stats, format_stats
 
+runs = 1000
 iterations = 100
+seed = None # Semilla base del lote, con la misma semilla se repiten las partidas
+output = None # Carpeta donde guardar un registro por partida, None para no guardar
+checkpoint = None # Archivo para reanudar el lote si se interrumpe, None para no guardar
+profile = False # Mide el tiempo de cada fase de los turnos y cuenta las búsquedas, y los imprime en el resumen
 
-for j in range(1000):
-    dead = 0
-    rescued = 0
-    wins = 0
-    damage = 0
-    max_person = 0
-
-    dead_losses = 0
-    damage_losses = 0
-
-    for i in range(iterations):
-        simulation = Map(False)
-
-        while not simulation.game_over():
-            simulation.turn()
-
-        rescued += simulation.poi.rescued_victims
-        dead += simulation.poi.scared_victims
-        damage += simulation.damage_points
-        if simulation.win:
-            wins += 1
-
-        if simulation.poi.rescued_victims > max_person:
-            max_person = simulation.poi.rescued_victims
-
-        if simulation.damage_points >= 24:
-            damage_losses += 1
-        elif not simulation.win:
-            dead_losses += 1
-
-    win_rate = wins / iterations * 100
-
-    if win_rate >= 10:
-        print(f"Run {j+1}/{1000}")
-        print(f"Total rescued victims: {rescued}")
-        print(f"Max rescued victims: {max_person}")
-        print(f"Total dead victims: {dead}")
-        print(f"Total damage points: {damage}")
-        print(f"Total wins: {wins} out of {iterations} ({win_rate}%)")
-        print(f"Dead losses: {dead_losses}")
-        print(f"Damage losses: {damage_losses}")
-        print("")
-        print("")
\ No newline at end of file
+# Muestreo secuencial: cada corrida se detiene cuando su intervalo de confianza
+# es más angosto que ci_width o queda debajo del porcentaje de victorias mínimo
+adaptive = False
+ci_width = 10
+min_win_rate = 10
+
+if __name__ == "__main__":
+    sink = None
+    if output is not None:
+        sink = ResultSink(output)
+
+    # Las partidas se reparten entre todos los núcleos disponibles
+    if adaptive:
+        summaries = run_adaptive(runs, False, seed, iterations, min_win_rate, ci_width, sink=sink, profile=profile)
+    else:
+        summaries = run_batch(runs, iterations, False, seed, sink, checkpoint=checkpoint, profile=profile)
+
+    played = 0
+    timings = {}
+    search_stats = {}
+    for summary in summaries:
+        win_rate = summary.win_rate()
+        played += summary.played
+        merge_timings(timings, summary.timings)
+        merge_stats(search_stats, summary.search_stats)
+
+        if win_rate >= min_win_rate:
+            print(f"Run {summary.run+1}/{runs}")
+            print(f"Total rescued victims: {summary.rescued}")
+            print(f"Max rescued victims: {summary.max_person}")
+            print(f"Total dead victims: {summary.dead}")
+            print(f"Total damage points: {summary.damage}")
+            print(f"Total wins: {summary.wins} out of {summary.played} ({win_rate}%)")
+            print(f"Dead losses: {summary.dead_losses}")
+            print(f"Damage losses: {summary.damage_losses}")
+            if profile:
+                print(format_timings(summary.timings))
+                print(format_stats(summary.search_stats))
+            print("")
+            print("")
+
+    if adaptive:
+        saved = runs * iterations - played
+        print(f"Games played: {played} out of {runs * iterations} ({saved} saved, {saved / (runs * iterations) * 100}%)")
+
+    if profile:
+        print("Phase timings of the whole batch:")
+        print(format_timings(timings))
+        print("Search counters of the whole batch:")
+        print(format_stats(search_stats))
+
+    if sink is not None:
+        sink.close()
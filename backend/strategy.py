@@ -0,0 +1,51 @@
+class Strategy:
+    """Los parámetros de la estrategia de los héroes en la simulación con strat.
+
+    Attributes:
+        ghost_density (float): La proporción de casillas con fantasma a partir
+            de la cual un héroe prefiere ir por fantasmas en vez de POIs.
+        ghost_multiplier (float): El multiplicador del costo de cruzar niebla
+            o fantasmas cuando el héroe va por fantasmas.
+        ghost_divisor (float): Lo que se divide el multiplicador por cada
+            vecino con fantasma al buscar caminos.
+        ghost_neighbor_bonus (float): Lo que se le resta a la distancia de un
+            fantasma por cada fantasma vecino que tiene.
+        assignment (str): Cómo se reparten los POIs entre los héroes:
+            "optimal" le da a cada POI un héroe distinto minimizando la suma
+            de distancias (ver assignment.py), "nearest" manda a cada POI
+            a sus héroes más cercanos, como originalmente.
+        spawn_distance (str): Cómo se elige el spawn point al que regresa un
+            héroe alcanzado por un fantasma: "walking" por la distancia
+            caminando (ver Walls.walking_distances), "manhattan" por la
+            distancia manhattan, como originalmente.
+    """
+
+    def __init__(self, ghost_density=0.2, ghost_multiplier=0.8, ghost_divisor=3, ghost_neighbor_bonus=3, assignment="optimal", spawn_distance="walking"):
+        """Constructor de la estrategia. Los parámetros de los fantasmas son
+        por defecto los valores originales, pero assignment="optimal" y
+        spawn_distance="walking" cambian cómo se juega; con "nearest" y
+        "manhattan" se juegan las partidas como originalmente.
+        """
+
+        self.ghost_density = ghost_density
+        self.ghost_multiplier = ghost_multiplier
+        self.ghost_divisor = ghost_divisor
+        self.ghost_neighbor_bonus = ghost_neighbor_bonus
+        self.assignment = assignment
+        self.spawn_distance = spawn_distance
+
+    def to_dict(self):
+        """Regresa los parámetros como diccionario."""
+
+        return {
+            "ghost_density": self.ghost_density,
+            "ghost_multiplier": self.ghost_multiplier,
+            "ghost_divisor": self.ghost_divisor,
+            "ghost_neighbor_bonus": self.ghost_neighbor_bonus,
+            "assignment": self.assignment,
+            "spawn_distance": self.spawn_distance
+        }
+
+    def __repr__(self):
+        values = ", ".join(f"{key}={value}" for (key, value) in self.to_dict().items())
+        return f"Strategy({values})"
@@ -0,0 +1,121 @@
+from imports import *
+
+import itertools
+import multiprocessing
+
+from runner import game_seed, play_game, default_chunksize
+
+# Valores por defecto del barrido, alrededor de los valores originales
+DEFAULT_GRID = {
+    "ghost_density": [0.1, 0.2, 0.3],
+    "ghost_multiplier": [0.6, 0.8, 1],
+    "ghost_divisor": [2, 3],
+    "ghost_neighbor_bonus": [1, 3, 5],
+}
+
+def strategy_grid(grid):
+    """Genera una Strategy por cada combinación de valores.
+
+    Args:
+        grid (dict[str, list]): Los valores a probar de cada parámetro.
+
+    Returns:
+        list[Strategy]: Las estrategias a probar.
+    """
+
+    names = list(grid.keys())
+    return [Strategy(**dict(zip(names, values))) for values in itertools.product(*grid.values())]
+
+def play_config(task):
+    """Juega una partida de una configuración del barrido.
+
+    Args:
+        task (tuple[int, tuple]): El índice de la configuración y la partida a jugar.
+
+    Returns:
+        tuple[int, GameOutcome]: El índice de la configuración y el resultado.
+    """
+
+    (config, game) = task
+    return (config, play_game(game))
+
+class SweepRow:
+    """Acumula los resultados de una configuración del barrido."""
+
+    def __init__(self, strategy: Strategy):
+        self.strategy = strategy
+        self.games = 0
+        self.wins = 0
+        self.damage = 0
+        self.steps = 0
+
+    def add(self, outcome):
+        """Añade el resultado de una partida a la configuración."""
+
+        self.games += 1
+        self.wins += outcome.win
+        self.damage += outcome.damage_points
+        self.steps += outcome.num_steps
+
+    def win_rate(self):
+        return self.wins / self.games * 100
+
+    def mean_damage(self):
+        return self.damage / self.games
+
+    def mean_steps(self):
+        return self.steps / self.games
+
+def run_sweep(strategies, games, seed=None, processes=None, chunksize=None):
+    """Juega games partidas con cada estrategia, repartiendo los pares
+    (configuración, semilla) en una sola cola de trabajo para todos los núcleos.
+
+    Todas las configuraciones juegan las mismas semillas, así las diferencias
+    entre filas vienen de los parámetros y no de la suerte de cada una.
+
+    Args:
+        strategies (list[Strategy]): Las configuraciones a probar.
+        games (int): Las partidas por configuración.
+        seed (int): La semilla base, None para usar una aleatoria.
+        processes (int): Los procesos a usar, por defecto todos los núcleos.
+        chunksize (int): Las partidas que se mandan juntas a cada proceso.
+
+    Returns:
+        list[SweepRow]: Los resultados de cada configuración, en el mismo orden.
+    """
+
+    if processes is None:
+        processes = multiprocessing.cpu_count()
+
+    if seed is None:
+        seed = np.random.SeedSequence().entropy
+
+    if chunksize is None:
+        chunksize = default_chunksize(len(strategies) * games, processes)
+
+    rows = [SweepRow(strategy) for strategy in strategies]
+    seeds = [game_seed(seed, i) for i in range(games)]
+
+    tasks = ((config, (False, seeds[i], strategy)) for (config, strategy) in enumerate(strategies) for i in range(games))
+
+    with multiprocessing.Pool(processes) as pool:
+        # El orden no importa, cada resultado trae el índice de su configuración
+        for (config, outcome) in pool.imap_unordered(play_config, tasks, chunksize):
+            rows[config].add(outcome)
+
+    return rows
+
+def print_table(rows):
+    """Imprime los resultados del barrido ordenados por porcentaje de victorias."""
+
+    names = list(rows[0].strategy.to_dict().keys())
+    header = names + ["games", "win_rate", "damage", "steps"]
+    print("\t".join(header))
+
+    for row in sorted(rows, key=lambda row: row.win_rate(), reverse=True):
+        values = [str(value) for value in row.strategy.to_dict().values()]
+        values += [str(row.games), f"{row.win_rate():.1f}", f"{row.mean_damage():.2f}", f"{row.mean_steps():.1f}"]
+        print("\t".join(values))
+
+if __name__ == "__main__":
+    print_table(run_sweep(strategy_grid(DEFAULT_GRID), 100, seed=0))
@@ -0,0 +1,46 @@
+import sys
+import threading
+
+from endpoint import app
+
+SEEDS = [11, 12, 13, 14]
+
+def play(client, mode, seed):
+    """Juega una partida con /play y regresa su resultado."""
+
+    response = client.get(f"/play/{mode}?seed={seed}")
+    assert response.status_code == 200
+    return response.get_json()
+
+def test_play_concurrent_matches_sequential():
+    """Dos partidas de /play al mismo tiempo, como con el servidor con
+    hilos, deben terminar igual que jugadas una después de otra.
+    """
+
+    client = app.test_client()
+    expected = {(mode, seed): play(client, mode, seed) for mode in ("naive", "strat") for seed in SEEDS}
+
+    # Cambiar de hilo muy seguido para que las búsquedas se intercalen
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-5)
+    try:
+        for mode in ("naive", "strat"):
+            for (first, second) in zip(SEEDS[::2], SEEDS[1::2]):
+                results = {}
+                barrier = threading.Barrier(2)
+
+                def run(seed):
+                    barrier.wait()
+                    results[seed] = play(app.test_client(), mode, seed)
+
+                threads = [threading.Thread(target=run, args=(seed,), daemon=True) for seed in (first, second)]
+                for thread in threads:
+                    thread.start()
+                for thread in threads:
+                    thread.join(timeout=60)
+                    assert not thread.is_alive(), "La partida no terminó"
+
+                assert results[first] == expected[(mode, first)]
+                assert results[second] == expected[(mode, second)]
+    finally:
+        sys.setswitchinterval(interval)
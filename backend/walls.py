@@ -8,6 +8,12 @@ if TYPE_CHECKING:
     from hero import *
     from actions import *
 
+# Los valores de una pared por la que se puede pasar
+FREE_PATH = (0, 2, 4)
+
+# Lo que cuesta cruzar una puerta cerrada en las distancias caminando (abrirla y pasar)
+DOOR_DISTANCE = 2
+
 class Walls:
     """Representa el tablero de juego con paredes y puertas.
 
@@ -27,8 +33,19 @@ class Walls:
     Attributes:
         vertical (list[list[float]]): Matriz de paredes y puertas verticales.
         horizontal (list[list[float]]): Matriz de paredes y puertas horizontales.
+        version (int): Contador de cambios, lo aumentan los setters.
+        open_mask (list[list[int]]): Por casilla, un bit por cada dirección
+            (1 << dirección, con arriba = 0, derecha = 1, abajo = 2 e
+            izquierda = 3) por la que se puede pasar.
+        door_mask (list[list[int]]): Igual, pero de las puertas cerradas.
+        open_neighbors (list[list[tuple]]): Las casillas vecinas accesibles
+            de cada casilla, lo que regresa get_neighbors.
+        door_neighbors (list[list[tuple]]): Las casillas vecinas con puerta
+            cerrada de por medio, lo que regresa get_closed_neighbors.
     """
 
+    initial_adjacency = None # La adyacencia del tablero inicial, compartida por todas las instancias
+
     def __init__(self):
         """Inicializa las matrices de paredes y puertas."""
 
@@ -58,6 +75,28 @@ class Walls:
 
         self.exits = [(6, 0), (0, 3), (9, 4), (3, 7)]
 
+        self.version = 0 # Aumenta con cada cambio, para saber si un camino sigue siendo válido
+
+        # Adyacencia precalculada, los setters solo actualizan las dos casillas de la pared.
+        # El tablero inicial siempre es el mismo, así que se calcula una sola vez
+        if Walls.initial_adjacency is None:
+            self.open_mask = [[0] * 10 for _ in range(8)]
+            self.door_mask = [[0] * 10 for _ in range(8)]
+            self.open_neighbors = [[()] * 10 for _ in range(8)]
+            self.door_neighbors = [[()] * 10 for _ in range(8)]
+
+            for y in range(8):
+                for x in range(10):
+                    self.update_cell(x, y)
+
+            Walls.initial_adjacency = (self.open_mask, self.door_mask, self.open_neighbors, self.door_neighbors)
+
+        (open_mask, door_mask, open_neighbors, door_neighbors) = Walls.initial_adjacency
+        self.open_mask = [row[:] for row in open_mask]
+        self.door_mask = [row[:] for row in door_mask]
+        self.open_neighbors = [row[:] for row in open_neighbors]
+        self.door_neighbors = [row[:] for row in door_neighbors]
+
     # Getters
     def get_left(self, x, y):
         """Devuelve el estado de la pared/puerta a la izquierda de (x, y)."""
@@ -87,6 +126,8 @@ class Walls:
     # Setters
     def set_left(self, x, y, value):
         """Asigna un valor a la pared/puerta izquierda de (x, y)."""
+        self.version += 1
+
         if y in [1, 9] and value in [0, 2, 4] and (x, y) not in self.exits:
             self.exits.append((x, y))
 
@@ -94,8 +135,13 @@ class Walls:
             return  # Fuera de límites
         self.vertical[y][x - 1] = value
 
+        self.update_cell(x - 1, y)
+        self.update_cell(x, y)
+
     def set_right(self, x, y, value):
         """Asigna un valor a la pared/puerta derecha de (x, y)."""
+        self.version += 1
+
         if y in [8, 0] and value in [0, 2, 4] and (x, y) not in self.exits:
             self.exits.append((x, y))
 
@@ -103,8 +149,13 @@ class Walls:
             return  # Fuera de límites
         self.vertical[y][x] = value
 
+        self.update_cell(x, y)
+        self.update_cell(x + 1, y)
+
     def set_up(self, x, y, value):
         """Asigna un valor a la pared/puerta arriba de (x, y)."""
+        self.version += 1
+
         if y in [1, 7] and value in [0, 2, 4] and (x, y) not in self.exits:
             self.exits.append((x, y))
 
@@ -112,8 +163,13 @@ class Walls:
             return  # Fuera de límites
         self.horizontal[y - 1][x] = value
 
+        self.update_cell(x, y - 1)
+        self.update_cell(x, y)
+
     def set_down(self, x, y, value):
         """Asigna un valor a la pared/puerta abajo de (x, y)."""
+        self.version += 1
+
         if y in [6, 0] and value in [0, 2, 4] and (x, y) not in self.exits:
             self.exits.append((x, y))
 
@@ -121,49 +177,100 @@ class Walls:
             return  # Fuera de límites
         self.horizontal[y][x] = value
 
+        self.update_cell(x, y)
+        self.update_cell(x, y + 1)
+
+    def update_cell(self, x, y):
+        """Recalcula la adyacencia de la casilla (x, y) con sus cuatro paredes."""
+
+        if not (0 <= x <= 9 and 0 <= y <= 7):
+            return
+
+        open_mask = 0
+        door_mask = 0
+        open_neighbors = ()
+        door_neighbors = ()
+
+        # En el orden de get_neighbors: izquierda, derecha, arriba, abajo
+        for (direction, value, neighbor) in (
+            (3, self.get_left(x, y), (x - 1, y)),
+            (1, self.get_right(x, y), (x + 1, y)),
+            (0, self.get_up(x, y), (x, y - 1)),
+            (2, self.get_down(x, y), (x, y + 1))
+        ):
+            if value in FREE_PATH:
+                open_mask |= 1 << direction
+                open_neighbors += (neighbor,)
+            elif value == 3:
+                door_mask |= 1 << direction
+                door_neighbors += (neighbor,)
+
+        self.open_mask[y][x] = open_mask
+        self.door_mask[y][x] = door_mask
+        self.open_neighbors[y][x] = open_neighbors
+        self.door_neighbors[y][x] = door_neighbors
+
+    def is_open(self, x, y, direction):
+        """Verifica si se puede pasar de (x, y) hacia la dirección dada."""
+        return self.open_mask[y][x] >> direction & 1 == 1
+
+    def is_door(self, x, y, direction):
+        """Verifica si hay una puerta cerrada de (x, y) hacia la dirección dada."""
+        return self.door_mask[y][x] >> direction & 1 == 1
+
     # Obtención de casillas adyacentes
     def get_neighbors(self, x, y):
         """Obtiene las casillas adyacentes accesibles desde (x, y).
 
         Una casilla es vecina si no hay pared, o si hay una puerta abierta
         o destruida.
-        """
-        neighbors = []
-        accepted_values = [0, 2, 4]  # Valores que representan adyacencia
-
-        # Verifica si las casillas de alrededor son adyacentes
-        if self.get_left(x, y) in accepted_values:
-            neighbors.append((x - 1, y))
-
-        if self.get_right(x, y) in accepted_values:
-            neighbors.append((x + 1, y))
-
-        if self.get_up(x, y) in accepted_values:
-            neighbors.append((x, y - 1))
-
-        if self.get_down(x, y) in accepted_values:
-            neighbors.append((x, y + 1))
 
-        return neighbors
+        Returns:
+            tuple[tuple[int, int]]: Los vecinos precalculados, no se deben modificar.
+        """
+        return self.open_neighbors[y][x]
     
     def get_closed_neighbors(self, x, y):
         """Obtiene las casillas adyacentes desde (x, y) donde
         haya una puerta de por medio.
+
+        Returns:
+            tuple[tuple[int, int]]: Los vecinos precalculados, no se deben modificar.
+        """
+        return self.door_neighbors[y][x]
+
+    # Distancias caminando
+    def walking_distances(self, start_x, start_y):
+        """Calcula la distancia caminando desde (x, y) hasta cada casilla.
+
+        Un paso por una pared abierta cuesta 1 y por una puerta cerrada
+        DOOR_DISTANCE; los fantasmas no cuentan.
+
+        Returns:
+            list[float]: La distancia a cada casilla con el índice
+                x * height + y, igual que en search.py, inf si no se puede
+                llegar.
         """
 
-        neighbors = []
-        
-        # Verifica si las casillas de tienen puerta
-        if self.get_left(x, y) == 3:
-            neighbors.append((x - 1, y))
+        height = len(self.vertical)
+        width = len(self.vertical[0])
 
-        if self.get_right(x, y) == 3:
-            neighbors.append((x + 1, y))
+        distances = [np.inf] * (width * height)
+        start = start_x * height + start_y
+        distances[start] = 0
+        left_to_visit = [(0, start)]
 
-        if self.get_up(x, y) == 3:
-            neighbors.append((x, y - 1))
+        while left_to_visit:
+            (distance, current) = heapq.heappop(left_to_visit)
+            if distance > distances[current]: # Entrada vieja
+                continue
 
-        if self.get_down(x, y) == 3:
-            neighbors.append((x, y + 1))
+            (x, y) = divmod(current, height)
+            for (neighbors, cost) in ((self.open_neighbors[y][x], 1), (self.door_neighbors[y][x], DOOR_DISTANCE)):
+                for (neighbor_x, neighbor_y) in neighbors:
+                    neighbor = neighbor_x * height + neighbor_y
+                    if distance + cost < distances[neighbor]:
+                        distances[neighbor] = distance + cost
+                        heapq.heappush(left_to_visit, (distance + cost, neighbor))
 
-        return neighbors
\ No newline at end of file
+        return distances